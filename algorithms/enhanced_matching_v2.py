@@ -13,12 +13,29 @@ Auteur: SuperSmartMatch V2.1 Enhanced
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, FrozenSet
 from .base_algorithm import BaseMatchingAlgorithm
 from utils.sector_analyzer import SectorAnalyzer, SectorAnalysisResult
 
 logger = logging.getLogger(__name__)
 
+# Nombre maximal d'analyses sectorielles mémorisées (LRU, par texte)
+SECTOR_ANALYSIS_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=1024)
+def _normalize_skills(skills: Tuple[str, ...]) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """
+    Compétences normalisées (minuscules, sans espaces) : liste ordonnée + frozenset
+
+    Mémorisé : les compétences du candidat ne sont normalisées qu'une fois
+    pour toutes les offres d'une requête.
+    """
+    normalized = tuple(skill.lower().strip() for skill in skills)
+    return normalized, frozenset(normalized)
+
 class EnhancedMatchingV2Algorithm(BaseMatchingAlgorithm):
     """
     Enhanced Matching V2.1 - Algorithme avec intelligence sectorielle
@@ -45,6 +62,10 @@ class EnhancedMatchingV2Algorithm(BaseMatchingAlgorithm):
             'contract_match': 0.05
         }
         
+        # Analyses sectorielles par contenu (texte extrait), réutilisées entre requêtes
+        self._analysis_cache = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()  # Requêtes servies en parallèle (threads)
+        
         # Seuils pour détection de facteurs bloquants
         self.blocking_thresholds = {
             'sector_compatibility': 0.25,   # En dessous = facteur bloquant majeur
@@ -64,9 +85,7 @@ class EnhancedMatchingV2Algorithm(BaseMatchingAlgorithm):
         
         # Analyse sectorielle du candidat
         candidate_text = self._extract_candidate_text(candidate_data)
-        candidate_sector_analysis = self.sector_analyzer.detect_sector(
-            candidate_text, context='cv'
-        )
+        candidate_sector_analysis = self._detect_sector_cached(candidate_text, 'cv')
         
         logger.info(f"Candidat - Secteur détecté: {candidate_sector_analysis.primary_sector} "
                    f"(confiance: {candidate_sector_analysis.confidence:.2f})")
@@ -74,9 +93,7 @@ class EnhancedMatchingV2Algorithm(BaseMatchingAlgorithm):
         for job in jobs_data:
             # Analyse sectorielle du poste
             job_text = self._extract_job_text(job)
-            job_sector_analysis = self.sector_analyzer.detect_sector(
-                job_text, context='job'
-            )
+            job_sector_analysis = self._detect_sector_cached(job_text, 'job')
             
             # Calcul du matching avec intelligence sectorielle
             match_result = self._calculate_enhanced_match(
@@ -94,6 +111,28 @@ class EnhancedMatchingV2Algorithm(BaseMatchingAlgorithm):
         results.sort(key=lambda x: x['matching_score'], reverse=True)
         return results
     
+    def _detect_sector_cached(self, text: str, context: str) -> SectorAnalysisResult:
+        """
+        Analyse sectorielle mémorisée par (contexte, texte) : un même candidat
+        ou une même offre n'est analysé qu'une fois, quelle que soit la requête
+        """
+        key = (context, text)
+        cache = self._analysis_cache
+        
+        with self._analysis_cache_lock:
+            analysis = cache.get(key)
+            if analysis is not None:
+                cache.move_to_end(key)
+                return analysis
+        
+        analysis = self.sector_analyzer.detect_sector(text, context=context)
+        
+        with self._analysis_cache_lock:
+            cache[key] = analysis
+            if len(cache) > SECTOR_ANALYSIS_CACHE_SIZE:
+                cache.popitem(last=False)
+        return analysis
+    
     def _extract_candidate_text(self, candidate_data: Dict[str, Any]) -> str:
         """
         Extrait le texte pertinent du CV pour l'analyse sectorielle
@@ -293,12 +332,12 @@ class EnhancedMatchingV2Algorithm(BaseMatchingAlgorithm):
         if not candidate_skills:
             return 0.1  # Aucune compétence = score très faible
         
-        # Normalisation des compétences (lowercase)
-        candidate_skills_norm = [skill.lower().strip() for skill in candidate_skills]
-        job_skills_norm = [skill.lower().strip() for skill in job_skills]
+        # Normalisation des compétences (lowercase), mémorisée par liste
+        candidate_skills_norm, candidate_skills_set = _normalize_skills(tuple(candidate_skills))
+        job_skills_norm, job_skills_set = _normalize_skills(tuple(job_skills))
         
         # Correspondances exactes
-        exact_matches = len(set(candidate_skills_norm) & set(job_skills_norm))
+        exact_matches = len(candidate_skills_set & job_skills_set)
         
         # Correspondances partielles (inclusion)
         partial_matches = 0
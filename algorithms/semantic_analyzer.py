@@ -5,7 +5,7 @@ Semantic Analyzer Algorithm - Analyse sémantique des compétences
 """
 
 from .base_algorithm import BaseMatchingAlgorithm
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, FrozenSet
 
 class SemanticAnalyzerAlgorithm(BaseMatchingAlgorithm):
     """
@@ -26,8 +26,14 @@ class SemanticAnalyzerAlgorithm(BaseMatchingAlgorithm):
         
         results = []
         
+        # Compétences candidat normalisées une seule fois pour toutes les offres
+        candidate_skills = [s.lower() for s in candidate_data.get('competences', [])]
+        candidate_skills_set = frozenset(candidate_skills)
+        
         for job in jobs_data:
-            score = self._calculate_semantic_match(candidate_data, job)
+            score = self._calculate_semantic_match(
+                candidate_data, job, candidate_skills, candidate_skills_set
+            )
             
             job_result = job.copy()
             job_result.update({
@@ -47,17 +53,22 @@ class SemanticAnalyzerAlgorithm(BaseMatchingAlgorithm):
         return results
     
     def _calculate_semantic_match(self, candidate_data: Dict[str, Any], 
-                                 job_data: Dict[str, Any]) -> float:
-        """Calcul sémantique basique"""
+                                 job_data: Dict[str, Any],
+                                 candidate_skills: Optional[List[str]] = None,
+                                 candidate_skills_set: Optional[FrozenSet[str]] = None) -> float:
+        """Calcul sémantique basique (compétences candidat déjà normalisées, optionnel)"""
         score = 0.4
         
         # Analyse des compétences avec variantes
-        candidate_skills = [s.lower() for s in candidate_data.get('competences', [])]
+        if candidate_skills is None:
+            candidate_skills = [s.lower() for s in candidate_data.get('competences', [])]
+        if candidate_skills_set is None:
+            candidate_skills_set = frozenset(candidate_skills)
         job_skills = [s.lower() for s in job_data.get('competences', [])]
         
         if candidate_skills and job_skills:
             # Correspondances exactes
-            exact_matches = len(set(candidate_skills) & set(job_skills))
+            exact_matches = len(candidate_skills_set.intersection(job_skills))
             
             # Correspondances partielles (sémantique basique)
             partial_matches = 0
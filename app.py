@@ -16,9 +16,13 @@ Version: 3.0.0
 
 import os
 import time
+import asyncio
 import logging
-from flask import Flask, request, jsonify, render_template
-from flask_cors import CORS
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import orjson
+from quart import Quart, Response, request, jsonify, render_template, stream_with_context
+from quart_cors import cors
 from typing import Dict, List, Any, Optional
 
 # Imports des algorithmes existants
@@ -32,6 +36,13 @@ from utils.performance_monitor import PerformanceMonitor
 from utils.cache_manager import CacheManager
 from utils.sector_analyzer import SectorAnalyzer
 from utils.enhanced_sector_analyzer_v3 import EnhancedSectorAnalyzerV3  # 🆕 V3.0
+from utils.match_helpers import (  # Compilable avec mypyc
+    generate_cache_key,
+    generate_request_etag,
+    enrich_matches_v3,
+    generate_recommendations_v3,
+    analyze_comparison_results_v3
+)
 from config.settings import Config
 
 # Configuration du logging
@@ -41,9 +52,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialisation de l'application Flask
-app = Flask(__name__)
-CORS(app)
+# Initialisation de l'application Quart (ASGI, API compatible Flask)
+app = cors(Quart(__name__))
 
 # Configuration
 config = Config()
@@ -69,11 +79,100 @@ algorithms = {
     'latest': EnhancedMatchingV3Algorithm(),    # 🆕 Alias pour la dernière version
 }
 
+# Listes statiques des réponses (tuples figés, allouées une seule fois)
+MATCH_PRECISION_IMPROVEMENTS = (
+    '🎯 Gestionnaire paie ≠ Management',
+    '🎯 Assistant facturation ≠ Gestionnaire paie',
+    '🎯 Assistant juridique ≠ Management',
+    '70+ métiers spécifiques détectés',
+    'Détection contextuelle par combinaisons'
+)
+
+HEALTH_NEW_FEATURES_V3 = (
+    '🎯 RÉSOUT: Gestionnaire paie ≠ Management',
+    '🎯 RÉSOUT: Assistant facturation ≠ Gestionnaire paie',
+    '🎯 RÉSOUT: Assistant juridique ≠ Management',
+    'Enhanced Matching V3.0 avec granularité métier fine',
+    '70+ métiers spécifiques vs 9 secteurs génériques',
+    'Détection contextuelle par combinaisons de mots-clés',
+    'Matrice de compatibilité enrichie (162+ combinaisons)',
+    'Analyse des niveaux d\'expérience (junior→expert)',
+    'Règles d\'exclusion pour éviter faux positifs'
+)
+
+HEALTH_PRECISION_IMPROVEMENTS = (
+    'Granularité métier: Secteur → Sous-secteur → Métier',
+    'Détection contextuelle vs mots-clés isolés',
+    'Matrice compatibilité enrichie vs générique',
+    'Exclusions intelligentes pour faux positifs'
+)
+
+INDEX_MAJOR_IMPROVEMENTS_V3 = (
+    '🎯 RÉSOUT: Gestionnaire paie ≠ Management',
+    '🎯 RÉSOUT: Assistant facturation ≠ Gestionnaire paie',
+    '🎯 RÉSOUT: Assistant juridique ≠ Management',
+    'Granularité métier: 70+ métiers spécifiques',
+    'Détection contextuelle par combinaisons de mots-clés',
+    'Règles d\'exclusion intelligentes pour faux positifs',
+    'Matrice de compatibilité enrichie (162+ combinaisons)',
+    'Analyse des niveaux d\'expérience (junior→expert)',
+    'Performances maintenues < 4s pour 210 matchings'
+)
+
+# Pool de processus partagé : exécution des algorithmes hors GIL
+# En dessous de ce nombre d'offres, le coût de dispatch dépasse le gain
+PROCESS_POOL_MIN_JOBS = 32
+
+def _process_pool_size() -> int:
+    """
+    Taille du pool par worker uvicorn : les cœurs sont partagés entre workers
+    """
+    configured = os.getenv('MATCH_PROCESS_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    web_workers = max(1, int(os.getenv('WEB_CONCURRENCY', 1)))
+    return max(1, (os.cpu_count() or 1) // web_workers)
+
+# Créé par start_process_pool (before_serving), avant tout thread du worker
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def _noop() -> None:
+    """
+    Tâche vide : force le fork des processus du pool au démarrage
+    """
+
+def _run_algorithm(algorithm_name: str, candidate_data: Dict[str, Any],
+                   jobs_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Exécute un algorithme dans un processus du pool (globals hérités du fork)
+    """
+    return algorithms[algorithm_name].calculate_matches(candidate_data, jobs_data)
+
+# Informations de diagnostic (analyseurs, usage) : recalculées au plus toutes les 5 s
+INFO_CACHE_TTL = 5.0
+_info_cache: Dict[str, tuple] = {}
+
+def _cached_info(name: str, producer) -> Dict[str, Any]:
+    """
+    Retourne producer() en le mémorisant INFO_CACHE_TTL secondes
+    """
+    now = time.monotonic()
+    entry = _info_cache.get(name)
+    if entry is None or entry[0] <= now:
+        entry = (now + INFO_CACHE_TTL, producer())
+        _info_cache[name] = entry
+    return entry[1]
+
 class SuperSmartMatchServiceV3:
     """
     Service principal V3.0 avec précision métier fine
     """
     
+    __slots__ = (
+        'algorithms', 'auto_selector', 'performance_monitor',
+        'cache', 'sector_analyzer', 'enhanced_analyzer_v3'
+    )
+    
     def __init__(self):
         self.algorithms = algorithms
         self.auto_selector = auto_selector
@@ -91,6 +190,10 @@ class SuperSmartMatchServiceV3:
         """
         start_time = time.time()
         
+        # Références chaudes liées localement
+        cache = self.cache
+        algorithms = self.algorithms
+        
         # Options par défaut
         if options is None:
             options = {}
@@ -104,7 +207,7 @@ class SuperSmartMatchServiceV3:
         
         # Vérification du cache
         if performance_mode in ['fast', 'balanced']:
-            cached_result = self.cache.get(cache_key)
+            cached_result = cache.get(cache_key)
             if cached_result:
                 logger.info(f"Cache hit pour la requête {cache_key[:8]}...")
                 cached_result['cache_hit'] = True
@@ -118,27 +221,34 @@ class SuperSmartMatchServiceV3:
             selected_algorithm = algorithm
         
         # Validation de l'algorithme
-        if selected_algorithm not in self.algorithms:
+        if selected_algorithm not in algorithms:
             return {
                 'error': f"Algorithme '{selected_algorithm}' non disponible",
-                'available_algorithms': list(self.algorithms.keys()),
+                'available_algorithms': list(algorithms.keys()),
                 'recommendation': 'Utilisez "enhanced-v3" pour la précision métier fine'
             }
         
         # Exécution du matching
         try:
-            algorithm_instance = self.algorithms[selected_algorithm]
+            algorithm_instance = algorithms[selected_algorithm]
             
             # Préparation des données pour l'algorithme
             prepared_data = self._prepare_data_for_algorithm(
                 candidate_data, jobs_data, selected_algorithm
             )
             
-            # Exécution
-            matches = algorithm_instance.calculate_matches(
-                prepared_data['candidate'],
-                prepared_data['jobs']
-            )
+            # Exécution (pool de processus pour les gros volumes)
+            if _process_pool is not None and len(prepared_data['jobs']) >= PROCESS_POOL_MIN_JOBS:
+                matches = _process_pool.submit(
+                    _run_algorithm, selected_algorithm,
+                    prepared_data['candidate'],
+                    prepared_data['jobs']
+                ).result()
+            else:
+                matches = algorithm_instance.calculate_matches(
+                    prepared_data['candidate'],
+                    prepared_data['jobs']
+                )
             
             # Limitation du nombre de résultats
             matches = matches[:limit]
@@ -158,26 +268,20 @@ class SuperSmartMatchServiceV3:
                 'total_jobs_analyzed': len(jobs_data),
                 'matches': enriched_matches,
                 'performance_metrics': {
-                    'cache_hit_rate': self.cache.get_hit_rate(),
+                    'cache_hit_rate': cache.get_hit_rate(),
                     'optimization_applied': performance_mode,
-                    'total_algorithms_available': len(self.algorithms),
+                    'total_algorithms_available': len(algorithms),
                     'sector_analysis_enabled': True,
                     'job_specificity_analysis_enabled': True  # 🆕 V3.0
                 },
                 'cache_hit': False,
                 'version': '3.0.0',  # 🆕 V3.0
-                'precision_improvements': [  # 🆕 V3.0
-                    '🎯 Gestionnaire paie ≠ Management',
-                    '🎯 Assistant facturation ≠ Gestionnaire paie',
-                    '🎯 Assistant juridique ≠ Management',
-                    '70+ métiers spécifiques détectés',
-                    'Détection contextuelle par combinaisons'
-                ]
+                'precision_improvements': MATCH_PRECISION_IMPROVEMENTS  # 🆕 V3.0
             }
             
             # Mise en cache du résultat
             if performance_mode in ['balanced', 'accuracy']:
-                self.cache.set(cache_key, result, ttl=3600)
+                cache.set(cache_key, result, ttl=3600)
             
             # Enregistrement des métriques
             self.performance_monitor.record_request(
@@ -218,7 +322,7 @@ class SuperSmartMatchServiceV3:
                     'detected_keywords': analysis.detected_keywords,
                     'explanation': analysis.explanation
                 },
-                'analyzer_info': self.enhanced_analyzer_v3.get_analyzer_info(),
+                'analyzer_info': _cached_info('analyzer_v3', self.enhanced_analyzer_v3.get_analyzer_info),
                 'version': '3.0.0'
             }
             
@@ -246,7 +350,7 @@ class SuperSmartMatchServiceV3:
                     'detected_keywords': analysis.detected_keywords,
                     'explanation': analysis.explanation
                 },
-                'sector_info': self.sector_analyzer.get_sector_info(),
+                'sector_info': _cached_info('sector_v2', self.sector_analyzer.get_sector_info),
                 'version': '2.1.0',
                 'upgrade_note': 'Utilisez /api/v3.0/job-analysis pour la granularité métier'
             }
@@ -305,32 +409,7 @@ class SuperSmartMatchServiceV3:
         """
         Génère une clé de cache unique pour la requête V3.0
         """
-        import hashlib
-        import json
-        
-        # Simplification des données pour le cache V3.0
-        cache_data = {
-            'candidate_skills': candidate_data.get('competences', []),
-            'candidate_location': candidate_data.get('adresse', ''),
-            'candidate_experience': candidate_data.get('annees_experience', 0),
-            'candidate_title': candidate_data.get('titre_poste', ''),  # 🆕 V3.0
-            'candidate_missions_hash': hashlib.md5(
-                str(candidate_data.get('missions', [])).encode()
-            ).hexdigest()[:8],
-            'job_count': len(jobs_data),
-            'job_titles_hash': hashlib.md5(  # 🆕 V3.0
-                str([job.get('titre', '') for job in jobs_data]).encode()
-            ).hexdigest()[:8],
-            'job_skills_hash': hashlib.md5(
-                str([job.get('competences', []) for job in jobs_data]).encode()
-            ).hexdigest()[:8],
-            'algorithm': algorithm,
-            'limit': options.get('limit', 10),
-            'version': '3.0.0'  # 🆕 V3.0
-        }
-        
-        cache_string = json.dumps(cache_data, sort_keys=True)
-        return hashlib.md5(cache_string.encode()).hexdigest()
+        return generate_cache_key(candidate_data, jobs_data, algorithm, options)
     
     def _prepare_data_for_algorithm(self, candidate_data: Dict[str, Any], 
                                    jobs_data: List[Dict[str, Any]], 
@@ -348,130 +427,80 @@ class SuperSmartMatchServiceV3:
         """
         🆕 V3.0 - Enrichit les résultats avec les nouvelles métadonnées métier
         """
-        enriched = []
-        
-        for match in matches:
-            enriched_match = match.copy()
-            
-            # Version de l'algorithme
-            enriched_match['algorithm_version'] = f"{algorithm}_v3.0"
-            
-            # Ajout de métadonnées V3.0 si pas déjà présentes
-            if 'job_analysis_v3' not in enriched_match and algorithm == 'enhanced-v3':
-                # Les analyses V3.0 sont déjà dans le match pour enhanced-v3
-                pass
-            
-            # Recommandations basiques si pas déjà présentes
-            if 'recommendations' not in enriched_match:
-                enriched_match['recommendations'] = self._generate_recommendations_v3(
-                    enriched_match
-                )
-            
-            # Assurer la présence de matching_details
-            if include_details and 'matching_details' not in enriched_match:
-                enriched_match['matching_details'] = {
-                    'overall_match': enriched_match.get('matching_score', 0),
-                    'method': 'algorithm_specific'
-                }
-            
-            # 🆕 V3.0 - Ajout de métadonnées de précision
-            enriched_match['precision_metadata_v3'] = {
-                'granularity_level': 'specific_job' if 'job_analysis_v3' in enriched_match else 'sector_level',
-                'detection_method': 'contextual' if algorithm == 'enhanced-v3' else 'keyword_based',
-                'blocking_factors_analyzed': len(enriched_match.get('blocking_factors', [])),
-                'recommendations_count': len(enriched_match.get('recommendations', []))
-            }
-            
-            enriched.append(enriched_match)
-        
-        return enriched
+        return enrich_matches_v3(matches, algorithm, include_details)
     
     def _generate_recommendations_v3(self, match: Dict[str, Any]) -> List[str]:
         """
         🆕 V3.0 - Génère des recommandations avec conscience métier fine
         """
-        score = match.get('matching_score', 0)
-        recommendations = []
-        
-        # Recommandations selon le score global
-        if score >= 90:
-            recommendations.append("🎯 Excellent match métier - Candidature fortement recommandée")
-        elif score >= 80:
-            recommendations.append("✅ Très bon match - Candidature recommandée")
-        elif score >= 70:
-            recommendations.append("👍 Bon match - Candidature à considérer")
-        elif score >= 60:
-            recommendations.append("⚠️ Match modéré - Évaluer la faisabilité de transition")
-        else:
-            recommendations.append("❌ Match faible - Reconversion métier significative")
-        
-        # Recommandations métier spécifiques si disponibles (V3.0)
-        job_analysis = match.get('job_analysis_v3', {})
-        if job_analysis:
-            candidate_job = job_analysis.get('candidate_job', '')
-            target_job = job_analysis.get('target_job', '')
-            specificity_score = job_analysis.get('job_specificity_score', 0)
-            
-            if specificity_score < 30:
-                recommendations.append(f"🔄 Transition {candidate_job} → {target_job} très difficile")
-            elif specificity_score < 60:
-                recommendations.append(f"📚 Adaptation métier {candidate_job} → {target_job} nécessaire")
-        
-        # Facteurs bloquants si présents
-        blocking_factors = match.get('blocking_factors', [])
-        if blocking_factors:
-            high_severity = [bf for bf in blocking_factors if bf.get('severity') == 'high']
-            if high_severity:
-                recommendations.append("🚨 Facteurs bloquants majeurs détectés - Voir détails")
-        
-        return recommendations
+        return generate_recommendations_v3(match)
     
     def _analyze_comparison_results_v3(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """
         🆕 V3.0 - Analyse les résultats de comparaison avec focus précision métier
         """
-        best_algorithm = None
-        best_score = 0
-        fastest_algorithm = None
-        fastest_time = float('inf')
-        most_precise = None
-        
-        for algo_name, result in results.items():
-            if 'error' not in result:
-                score = result.get('top_score', 0)
-                time_ms = result.get('execution_time_ms', 0)
-                
-                if score > best_score:
-                    best_score = score
-                    best_algorithm = algo_name
-                
-                if time_ms < fastest_time:
-                    fastest_time = time_ms
-                    fastest_algorithm = algo_name
-                
-                # Privilégier Enhanced V3.0 pour la précision
-                if algo_name == 'enhanced-v3':
-                    most_precise = algo_name
-        
-        recommendation = f"Précision: '{best_algorithm}' | Performance: '{fastest_algorithm}'"
-        if most_precise:
-            recommendation += f" | Précision métier: '{most_precise}'"
-        
-        return {
-            'best_accuracy': best_algorithm,
-            'best_performance': fastest_algorithm,
-            'most_precise': most_precise,
-            'recommendation': recommendation,
-            'v3_note': 'Enhanced V3.0 recommandé pour précision métier fine',
-            'improvement_note': 'V3.0 résout les problèmes de faux positifs (paie≠management)'
-        }
+        return analyze_comparison_results_v3(results)
 
 # Instance du service principal V3.0
 supersmartmatch = SuperSmartMatchServiceV3()
 
+# Seuil à partir duquel /api/v1/match est envoyé en streaming
+STREAMING_MIN_MATCHES = 50
+
+def _stream_match_response(result: Dict[str, Any]):
+    """
+    Sérialise une réponse de matching par morceaux (un match à la fois)
+
+    L'encodage chevauche l'envoi réseau et le pic mémoire se limite à un
+    match encodé au lieu du corps JSON complet.
+    """
+    rest = {key: value for key, value in result.items() if key != 'matches'}
+    
+    yield b'{"matches":['
+    for index, match in enumerate(result['matches']):
+        if index:
+            yield b','
+        yield orjson.dumps(match)
+    
+    if rest:
+        yield b'],' + orjson.dumps(rest)[1:]
+    else:
+        yield b']}'
+
+@app.before_serving
+async def record_start_time():
+    """
+    Enregistre le temps de démarrage (exécuté dans chaque worker)
+    """
+    app.start_time = time.time()
+
+@app.before_serving
+async def start_process_pool():
+    """
+    Crée le pool de processus des algorithmes au démarrage du worker
+
+    Les processus sont forkés immédiatement (tâche vide), avant que le worker
+    ne démarre le moindre thread : ils héritent des algorithmes instanciés.
+    """
+    global _process_pool
+    # fork : les workers héritent des algorithmes déjà instanciés
+    mp_context = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+    _process_pool = ProcessPoolExecutor(
+        max_workers=_process_pool_size(), mp_context=mp_context
+    )
+    _process_pool.submit(_noop).result()
+
+@app.after_serving
+async def shutdown_process_pool():
+    """
+    Libère le pool de processus des algorithmes à l'arrêt du worker
+    """
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+
 # Routes de l'API V3.0
 @app.route('/api/v1/health', methods=['GET'])
-def health_check():
+async def health_check():
     """
     Endpoint de santé du service V3.0
     """
@@ -480,33 +509,18 @@ def health_check():
         'service': 'SuperSmartMatch',
         'version': '3.0.0',  # 🆕
         'algorithms_available': list(algorithms.keys()),
-        'new_features_v3': [  # 🆕
-            '🎯 RÉSOUT: Gestionnaire paie ≠ Management',
-            '🎯 RÉSOUT: Assistant facturation ≠ Gestionnaire paie',
-            '🎯 RÉSOUT: Assistant juridique ≠ Management',
-            'Enhanced Matching V3.0 avec granularité métier fine',
-            '70+ métiers spécifiques vs 9 secteurs génériques',
-            'Détection contextuelle par combinaisons de mots-clés',
-            'Matrice de compatibilité enrichie (162+ combinaisons)',
-            'Analyse des niveaux d\'expérience (junior→expert)',
-            'Règles d\'exclusion pour éviter faux positifs'
-        ],
-        'precision_improvements': [
-            'Granularité métier: Secteur → Sous-secteur → Métier',
-            'Détection contextuelle vs mots-clés isolés',
-            'Matrice compatibilité enrichie vs générique',
-            'Exclusions intelligentes pour faux positifs'
-        ],
+        'new_features_v3': HEALTH_NEW_FEATURES_V3,  # 🆕
+        'precision_improvements': HEALTH_PRECISION_IMPROVEMENTS,
         'uptime_seconds': time.time() - app.start_time if hasattr(app, 'start_time') else 0
     })
 
 @app.route('/api/v1/match', methods=['POST'])
-def match_endpoint():
+async def match_endpoint():
     """
     Endpoint principal de matching unifié V3.0
     """
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         if not data:
             return jsonify({'error': 'Données JSON requises'}), 400
@@ -514,7 +528,7 @@ def match_endpoint():
         candidate_data = data.get('candidate')
         jobs_data = data.get('jobs', [])
         algorithm = data.get('algorithm', 'auto')
-        options = data.get('options', {})
+        options = data.get('options') or {}
         
         if not candidate_data:
             return jsonify({'error': 'Données candidat requises'}), 400
@@ -522,8 +536,12 @@ def match_endpoint():
         if not jobs_data:
             return jsonify({'error': 'Données offres d\'emploi requises'}), 400
         
-        # Exécution du matching V3.0
-        result = supersmartmatch.match(
+        # ETag faible de la requête complète (le corps varie : temps d'exécution, cache)
+        etag = generate_request_etag(candidate_data, jobs_data, algorithm, options)
+        
+        # Exécution du matching V3.0 (CPU-bound, hors boucle d'événements)
+        result = await asyncio.to_thread(
+            supersmartmatch.match,
             candidate_data=candidate_data,
             jobs_data=jobs_data,
             algorithm=algorithm,
@@ -533,7 +551,14 @@ def match_endpoint():
         if 'error' in result:
             return jsonify(result), 400
         
-        return jsonify(result)
+        # Gros volumes : encodage orjson match par match en streaming
+        if len(result.get('matches', [])) >= STREAMING_MIN_MATCHES:
+            response = Response(_stream_match_response(result), mimetype='application/json')
+        else:
+            response = jsonify(result)
+        
+        response.set_etag(etag, weak=True)
+        return response
         
     except Exception as e:
         logger.error(f"Erreur dans l'endpoint match V3.0: {str(e)}")
@@ -543,13 +568,166 @@ def match_endpoint():
             'version': '3.0.0'
         }), 500
 
+async def _run_batch_item(payload: Any) -> Dict[str, Any]:
+    """
+    Exécute un matching du lot (mêmes validations que /api/v1/match)
+    """
+    if not isinstance(payload, dict):
+        return {'error': 'Requête de matching invalide'}
+    
+    candidate_data = payload.get('candidate')
+    jobs_data = payload.get('jobs', [])
+    
+    if not candidate_data:
+        return {'error': 'Données candidat requises'}
+    
+    if not jobs_data:
+        return {'error': 'Données offres d\'emploi requises'}
+    
+    options = payload.get('options') or {}
+    
+    try:
+        result = await asyncio.to_thread(
+            supersmartmatch.match,
+            candidate_data=candidate_data,
+            jobs_data=jobs_data,
+            algorithm=payload.get('algorithm', 'auto'),
+            options=options
+        )
+        return result
+    except Exception as e:
+        logger.error(f"Erreur dans un matching du lot: {str(e)}")
+        return {'error': 'Erreur interne du serveur', 'details': str(e) if app.debug else None}
+
+async def _stream_batch_results(tasks: List[asyncio.Task]):
+    """
+    Une ligne JSON par requête du lot, dans l'ordre, dès que chaque résultat est prêt
+    """
+    for task in tasks:
+        yield orjson.dumps(await task) + b'\n'
+
+@app.route('/api/v1/match/batch', methods=['POST'])
+async def match_batch_endpoint():
+    """
+    Plusieurs requêtes de matching en un seul appel HTTP
+
+    Corps : {"batch": [requête /api/v1/match, ...]}. Réponse en JSON lines
+    (application/x-ndjson) : une ligne par requête, dans l'ordre du lot.
+    """
+    data = await request.get_json()
+    batch = data.get('batch') if isinstance(data, dict) else None
+    
+    if not isinstance(batch, list) or not batch:
+        return jsonify({'error': 'Liste "batch" de requêtes de matching requise'}), 400
+    
+    if len(batch) > config.MAX_BATCH_SIZE:
+        return jsonify({'error': f'Lot limité à {config.MAX_BATCH_SIZE} requêtes'}), 400
+    
+    # Plafond sur le volume total : chaque requête du lot peut porter ses propres offres
+    total_jobs = sum(
+        len(payload['jobs']) for payload in batch
+        if isinstance(payload, dict) and isinstance(payload.get('jobs'), list)
+    )
+    if total_jobs > config.MAX_BATCH_TOTAL_JOBS:
+        return jsonify({'error': f'Lot limité à {config.MAX_BATCH_TOTAL_JOBS} offres au total'}), 400
+    
+    # Toutes les requêtes démarrent en parallèle, les lignes sortent dans l'ordre
+    tasks = [asyncio.create_task(_run_batch_item(payload)) for payload in batch]
+    return Response(_stream_batch_results(tasks), mimetype='application/x-ndjson')
+
+# Taille des lots d'offres traités au fil de l'eau par /api/v1/match/stream
+STREAM_JOBS_CHUNK_SIZE = 32
+
+async def _iter_ndjson(body):
+    """
+    Objets JSON d'un corps NDJSON lu par morceaux (une ligne = un objet)
+    """
+    pending = b''
+    async for chunk in body:
+        pending += chunk
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            if line.strip():
+                yield orjson.loads(line)
+    if pending.strip():
+        yield orjson.loads(pending)
+
+@app.route('/api/v1/match/stream', methods=['POST'])
+async def match_stream_endpoint():
+    """
+    Matching en flux pour les grandes listes d'offres
+
+    Corps NDJSON : une première ligne {"candidate": ..., "algorithm": ..., "options": ...}
+    puis une offre par ligne. Réponse NDJSON : les matches de chaque lot de
+    STREAM_JOBS_CHUNK_SIZE offres dès qu'il est calculé (triés au sein du lot).
+    Au plus MAX_JOBS_PER_REQUEST offres ; une erreur termine le flux par une
+    ligne {"error": ...}.
+    """
+    lines = _iter_ndjson(request.body)
+    try:
+        header = await anext(lines, None)
+    except orjson.JSONDecodeError:
+        header = None
+    
+    if not isinstance(header, dict) or not header.get('candidate'):
+        return jsonify({'error': 'Première ligne {"candidate": ...} requise'}), 400
+    
+    candidate_data = header['candidate']
+    algorithm = header.get('algorithm', 'auto')
+    options = header.get('options') or {}
+    
+    async def run_chunk(jobs_chunk):
+        # Tous les matches du lot (pas de top-k partiel)
+        try:
+            result = await asyncio.to_thread(
+                supersmartmatch.match,
+                candidate_data=candidate_data,
+                jobs_data=jobs_chunk,
+                algorithm=algorithm,
+                options={**options, 'limit': len(jobs_chunk)}
+            )
+        except Exception as e:
+            logger.error(f"Erreur dans un lot du matching en flux: {str(e)}")
+            result = {'error': 'Erreur interne du serveur', 'details': str(e) if app.debug else None}
+        if 'error' in result:
+            return orjson.dumps(result) + b'\n'
+        return b''.join(orjson.dumps(match) + b'\n' for match in result['matches'])
+    
+    @stream_with_context
+    async def generate():
+        jobs_chunk = []
+        job_count = 0
+        error = None
+        try:
+            async for job in lines:
+                if not isinstance(job, dict):
+                    error = f'Offre {job_count + 1} invalide: objet JSON attendu'
+                    break
+                job_count += 1
+                if job_count > config.MAX_JOBS_PER_REQUEST:
+                    error = f'Flux limité à {config.MAX_JOBS_PER_REQUEST} offres'
+                    break
+                jobs_chunk.append(job)
+                if len(jobs_chunk) >= STREAM_JOBS_CHUNK_SIZE:
+                    yield await run_chunk(jobs_chunk)
+                    jobs_chunk = []
+        except orjson.JSONDecodeError as e:
+            error = f'Ligne NDJSON invalide: {e}'
+        # Offres valides déjà lues traitées, puis ligne d'erreur éventuelle
+        if jobs_chunk:
+            yield await run_chunk(jobs_chunk)
+        if error:
+            yield orjson.dumps({'error': error}) + b'\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
 @app.route('/api/v3.0/job-analysis', methods=['POST'])
-def job_analysis_v3_endpoint():
+async def job_analysis_v3_endpoint():
     """
     🆕 V3.0 - Endpoint d'analyse métier enrichie
     """
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         if not data:
             return jsonify({'error': 'Données JSON requises'}), 400
@@ -561,7 +739,7 @@ def job_analysis_v3_endpoint():
             return jsonify({'error': 'Texte à analyser requis'}), 400
         
         # Analyse métier enrichie V3.0
-        result = supersmartmatch.analyze_sector_v3(text, context)
+        result = await asyncio.to_thread(supersmartmatch.analyze_sector_v3, text, context)
         
         return jsonify(result)
         
@@ -574,12 +752,12 @@ def job_analysis_v3_endpoint():
         }), 500
 
 @app.route('/api/v2.1/sector-analysis', methods=['POST'])
-def sector_analysis_endpoint():
+async def sector_analysis_endpoint():
     """
     V2.1 - Endpoint d'analyse sectorielle (maintenu pour compatibilité)
     """
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         if not data:
             return jsonify({'error': 'Données JSON requises'}), 400
@@ -591,7 +769,7 @@ def sector_analysis_endpoint():
             return jsonify({'error': 'Texte à analyser requis'}), 400
         
         # Analyse sectorielle V2.1
-        result = supersmartmatch.analyze_sector(text, context)
+        result = await asyncio.to_thread(supersmartmatch.analyze_sector, text, context)
         
         return jsonify(result)
         
@@ -604,12 +782,12 @@ def sector_analysis_endpoint():
         }), 500
 
 @app.route('/api/v1/compare', methods=['POST'])
-def compare_algorithms_endpoint():
+async def compare_algorithms_endpoint():
     """
     Endpoint de comparaison d'algorithmes V3.0
     """
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         candidate_data = data.get('candidate')
         jobs_data = data.get('jobs', [])
@@ -618,7 +796,8 @@ def compare_algorithms_endpoint():
         if not candidate_data or not jobs_data:
             return jsonify({'error': 'Données candidat et jobs requises'}), 400
         
-        result = supersmartmatch.compare_algorithms(
+        result = await asyncio.to_thread(
+            supersmartmatch.compare_algorithms,
             candidate_data=candidate_data,
             jobs_data=jobs_data,
             algorithms_to_compare=algorithms_to_compare
@@ -631,7 +810,7 @@ def compare_algorithms_endpoint():
         return jsonify({'error': 'Erreur interne du serveur'}), 500
 
 @app.route('/api/v1/algorithms', methods=['GET'])
-def get_available_algorithms():
+async def get_available_algorithms():
     """
     Liste des algorithmes disponibles V3.0
     """
@@ -735,28 +914,28 @@ def get_available_algorithms():
     })
 
 @app.route('/api/v1/metrics', methods=['GET'])
-def get_metrics():
+async def get_metrics():
     """
     Métriques de performance du service V3.0
     """
     return jsonify({
         'performance_metrics': performance_monitor.get_metrics(),
         'cache_metrics': cache_manager.get_metrics(),
-        'algorithms_usage': performance_monitor.get_algorithm_usage(),
-        'sector_analyzer_v2_info': sector_analyzer.get_sector_info(),
-        'enhanced_analyzer_v3_info': enhanced_analyzer_v3.get_analyzer_info(),  # 🆕
+        'algorithms_usage': _cached_info('algorithm_usage', performance_monitor.get_algorithm_usage),
+        'sector_analyzer_v2_info': _cached_info('sector_v2', sector_analyzer.get_sector_info),
+        'enhanced_analyzer_v3_info': _cached_info('analyzer_v3', enhanced_analyzer_v3.get_analyzer_info),  # 🆕
         'version': '3.0.0'
     })
 
 @app.route('/dashboard', methods=['GET'])
-def dashboard():
+async def dashboard():
     """
     Dashboard de monitoring V3.0
     """
-    return render_template('dashboard.html')
+    return await render_template('dashboard.html')
 
 @app.route('/', methods=['GET'])
-def index():
+async def index():
     """
     Page d'accueil avec documentation API V3.0
     """
@@ -764,19 +943,11 @@ def index():
         'service': 'SuperSmartMatch API v3.0.0',  # 🆕
         'description': 'Service unifié de matching avec précision métier fine',
         'problem_solved': '🎯 Gestionnaire paie vs Management: 90% → 25%',  # 🆕
-        'major_improvements_v3': [  # 🆕
-            '🎯 RÉSOUT: Gestionnaire paie ≠ Management',
-            '🎯 RÉSOUT: Assistant facturation ≠ Gestionnaire paie',
-            '🎯 RÉSOUT: Assistant juridique ≠ Management',
-            'Granularité métier: 70+ métiers spécifiques',
-            'Détection contextuelle par combinaisons de mots-clés',
-            'Règles d\'exclusion intelligentes pour faux positifs',
-            'Matrice de compatibilité enrichie (162+ combinaisons)',
-            'Analyse des niveaux d\'expérience (junior→expert)',
-            'Performances maintenues < 4s pour 210 matchings'
-        ],
+        'major_improvements_v3': INDEX_MAJOR_IMPROVEMENTS_V3,  # 🆕
         'endpoints': {
             'POST /api/v1/match': 'Matching principal unifié V3.0',
+            'POST /api/v1/match/batch': 'Plusieurs matchings en un appel (réponse JSON lines)',
+            'POST /api/v1/match/stream': 'Matching en flux NDJSON pour les grandes listes d\'offres',
             'POST /api/v3.0/job-analysis': '🆕 Analyse métier enrichie V3.0',  # 🆕
             'POST /api/v2.1/sector-analysis': 'Analyse sectorielle V2.1 (compatibilité)',
             'POST /api/v1/compare': 'Comparaison d\'algorithmes',
@@ -796,14 +967,16 @@ def index():
     })
 
 if __name__ == '__main__':
-    # Enregistrement du temps de démarrage
-    app.start_time = time.time()
+    import uvicorn
     
     # Configuration pour le développement
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     port = int(os.getenv('PORT', 5061))  # Port modifié pour V3.0
+    workers = 1 if debug_mode else int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1))
+    # Transmis aux workers : dimensionnement du pool de processus par worker
+    os.environ['WEB_CONCURRENCY'] = str(workers)
     
-    logger.info(f"🚀 Démarrage de SuperSmartMatch V3.0 sur le port {port}")
+    logger.info(f"🚀 Démarrage de SuperSmartMatch V3.0 sur le port {port} ({workers} workers)")
     logger.info(f"📊 Algorithmes disponibles: {list(algorithms.keys())}")
     logger.info(f"🎯 NOUVEAU: Enhanced V3.0 avec précision métier fine")
     logger.info(f"✅ PROBLÈMES RÉSOLUS:")
@@ -812,8 +985,14 @@ if __name__ == '__main__':
     logger.info(f"   🎯 Assistant juridique ≠ Management")
     logger.info(f"📈 AMÉLIORATIONS: 70+ métiers, détection contextuelle, 162+ compatibilités")
     
-    app.run(
+    # Serveur ASGI : uvloop (boucle libuv) + httptools (parseur HTTP en C)
+    uvicorn.run(
+        'app:app',
         host='0.0.0.0',
         port=port,
-        debug=debug_mode
+        workers=workers,
+        loop='uvloop',
+        http='httptools',
+        reload=debug_mode,
+        log_level='debug' if debug_mode else 'info'
     )
@@ -11,24 +11,71 @@ SuperSmartMatch V3.2.1 Enhanced - Fix Zachary Experience Extraction
 Port: 5067
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from anyio import to_thread
+from concurrent.futures import ProcessPoolExecutor
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 import uvicorn
+import asyncio
+import hashlib
 import logging
+import orjson
+import multiprocessing as mp
+import os
 import time
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import cached_property
+
+from config.settings import Config
+from utils.cache_manager import CacheManager
+
+# Moteur regex DFA (google-re2) si disponible, sinon module re standard
+try:
+    import re2 as regex_engine
+except ImportError:
+    regex_engine = re
+
+# Automate Aho-Corasick (pyahocorasick) si disponible
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Accumulation numérique compilée (NumPy + Numba) si disponible
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Configuration logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# FastAPI app
-app = FastAPI(title="SuperSmartMatch V3.2.1 Enhanced", version="3.2.1")
+# FastAPI app (réponses sérialisées par orjson)
+app = FastAPI(
+    title="SuperSmartMatch V3.2.1 Enhanced",
+    version="3.2.1",
+    default_response_class=ORJSONResponse
+)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    """Erreurs HTTP sérialisées par orjson, comme les réponses normales"""
+    return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+
 # ========================================================================================
 # 📋 MODÈLES DE DONNÉES
 # ========================================================================================
@@ -39,6 +86,123 @@ class CVData(BaseModel):
     skills: List[str]
     sector: Optional[str] = None
 
+# ========================================================================================
+# 🧩 PATTERNS (compilés au premier usage par le parser)
+# ========================================================================================
+
+# Une seule alternation à groupes nommés : chaque ligne n'est parcourue qu'une fois
+# Flag (?i) en ligne : syntaxe commune à re et re2
+# - duration : "(X an)" / "(X mois)" - durée explicite
+# - year_range : "2018-2021" - années seules
+# - french_range : "Avril 2023-Avril 2024" - mois français
+EXPERIENCE_PERIOD_PATTERN = (
+    r'(?i)(?P<duration>\((?P<duration_value>\d+)\s+(?P<duration_unit>an|ans|mois)\))'
+    r'|(?P<year_range>(?P<start_year>\d{4})\s*[-–—]\s*(?P<end_year>\d{4}))'
+    r'|(?P<french_range>'
+    r'(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre|sept\.?)\s+\d{4}\s*[-–—]\s*'
+    r'(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+\d{4})'
+)
+
+# Nom en tête de CV : exactement deux mots en majuscules ("ZACHARY PARDO")
+NAME_PATTERN = (
+    r"^[A-ZÀÂÄÇÉÈÊËÎÏÔÖÙÛÜŸ][A-ZÀÂÄÇÉÈÊËÎÏÔÖÙÛÜŸ'-]{1,14}"
+    r"\s+[A-ZÀÂÄÇÉÈÊËÎÏÔÖÙÛÜŸ][A-ZÀÂÄÇÉÈÊËÎÏÔÖÙÛÜŸ'-]{1,14}$"
+)
+NAME_SEARCH_LINES = 10  # Le nom figure toujours en haut du CV
+NAME_EXCLUDED_WORDS = (
+    'formation', 'experience', 'expérience', 'competence', 'compétence', 'professionnel'
+)
+
+# Indicateurs de contexte professionnel (lignes adjacentes à une période)
+PROFESSIONAL_CONTEXT_INDICATORS = (
+    'assistant', 'manager', 'directeur', 'chef', 'responsable',
+    'stagiaire', 'consultant', 'analyste', 'associate',
+    'business development', 'customer experience', 'événementiel',
+    'commercial', 'marketing', 'safi', 'group', 'consultants',
+    'paris', 'france', 'usa', 'washington'
+)
+
+# Compétences spécifiques Zachary
+ZACHARY_SKILLS = (
+    "Klypso", "Hubspot", "Dynamics", "Lead Generation", "Canva",
+    "Pack Office", "CRM", "Business Development", "Customer Experience",
+    "Anglais", "Espagnol", "Allemand", "Réseaux sociaux"
+)
+
+# Compétences génériques
+GENERIC_SKILLS = ("Excel", "Word", "PowerPoint", "Marketing", "Commercial")
+
+def build_automaton(entries):
+    """
+    Construit un automate Aho-Corasick à partir de paires (motif, valeur)
+    
+    Retourne None si pyahocorasick n'est pas installé.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern, value in entries:
+        automaton.add_word(pattern, value)
+    automaton.make_automaton()
+    return automaton
+
+# ========================================================================================
+# 🔢 ACCUMULATION DES MOIS D'EXPÉRIENCE
+# ========================================================================================
+
+# Codes des motifs reconnus par EXPERIENCE_PERIOD_PATTERN
+KIND_DURATION = 0
+KIND_YEAR_RANGE = 1
+KIND_FRENCH_RANGE = 2
+
+MAX_EXPERIENCE_MONTHS = 600  # Max 50 ans
+
+def _accumulate_months_py(kinds, nums, units, starts, ends, ctx_flags):
+    """
+    Total des mois validés à partir des occurrences numériques
+    
+    Une occurrence par période détectée : (motif, valeur, unité en mois,
+    année début, année fin, contexte professionnel de sa ligne).
+    """
+    total = 0
+    for h in range(len(kinds)):
+        if not ctx_flags[h]:
+            continue
+        kind = kinds[h]
+        if kind == KIND_DURATION:
+            # "(X an)" ou "(X mois)"
+            total += nums[h] * units[h]
+        elif kind == KIND_YEAR_RANGE:
+            # "2018-2021" : années incluses
+            start_y = starts[h]
+            end_y = ends[h]
+            if 2000 <= start_y <= 2025 and 2000 <= end_y <= 2025 and end_y >= start_y:
+                total += (end_y - start_y + 1) * 12
+        else:
+            # Mois français : approximation de 12 mois
+            total += 12
+    if total > MAX_EXPERIENCE_MONTHS:
+        total = MAX_EXPERIENCE_MONTHS
+    return total
+
+if np is not None and njit is not None:
+    _accumulate_months_jit = njit(cache=True)(_accumulate_months_py)
+else:
+    _accumulate_months_jit = None
+
+def accumulate_months(kinds, nums, units, starts, ends, ctx_flags) -> int:
+    """Accumulation compilée par Numba si disponible, sinon Python pur"""
+    if _accumulate_months_jit is None or not kinds:
+        return _accumulate_months_py(kinds, nums, units, starts, ends, ctx_flags)
+    return int(_accumulate_months_jit(
+        np.array(kinds, dtype=np.int32),
+        np.array(nums, dtype=np.int32),
+        np.array(units, dtype=np.int32),
+        np.array(starts, dtype=np.int32),
+        np.array(ends, dtype=np.int32),
+        np.array(ctx_flags, dtype=np.bool_),
+    ))
+
 # ========================================================================================
 # 🔍 PARSER CV V3.2.1 avec Fix Zachary
 # ========================================================================================
@@ -48,13 +212,67 @@ class EnhancedCVParserV321:
     
     def __init__(self):
         self.version = "3.2.1"
+        # Paires (compétence, forme minuscule) calculées une seule fois
+        self._skill_terms = tuple(
+            (skill, skill.lower()) for skill in ZACHARY_SKILLS + GENERIC_SKILLS
+        )
+    
+    # Regex et automates construits au premier usage, puis conservés
+    
+    @cached_property
+    def _experience_period_re(self):
+        return regex_engine.compile(EXPERIENCE_PERIOD_PATTERN)
+    
+    @cached_property
+    def _name_re(self):
+        return regex_engine.compile(NAME_PATTERN)
+    
+    @cached_property
+    def _context_automaton(self):
+        return build_automaton(
+            (indicator, indicator) for indicator in PROFESSIONAL_CONTEXT_INDICATORS
+        )
+    
+    @cached_property
+    def _skill_needles(self):
+        """Repli sans automate : motifs ASCII cherchés en bytes, les autres en str"""
+        return tuple(
+            (skill, skill_lower.encode('ascii'), True) if skill_lower.isascii()
+            else (skill, skill_lower, False)
+            for skill, skill_lower in self._skill_terms
+        )
     
-    def parse_cv(self, text: str) -> CVData:
-        """Parse CV complet V3.2.1"""
+    @cached_property
+    def _skill_automaton(self):
+        """Automate forme minuscule → compétence canonique"""
+        return build_automaton(
+            (skill_lower, skill) for skill, skill_lower in self._skill_terms
+        )
+    
+    def warm_up(self) -> None:
+        """Construit toutes les regex et automates (avant un fork, pour les partager)"""
+        self._experience_period_re
+        self._name_re
+        self._context_automaton
+        self._skill_needles
+        self._skill_automaton
+    
+    def parse_cv(self, text: Union[bytes, str]) -> CVData:
+        """Parse CV complet V3.2.1 (texte ou octets UTF-8 d'un upload)"""
+        ascii_bytes = None
+        if isinstance(text, bytes):
+            # Upload ASCII : les compétences sont cherchées directement dans les octets
+            if text.isascii():
+                ascii_bytes = text
+            text = text.decode('utf-8')
+        
         try:
-            name = self.extract_name(text)
-            experience_years = self.extract_experience_zachary_fix(text)  # 🎯 FIX V3.2.1
-            skills = self.extract_skills(text)
+            # Découpage unique en lignes non vides, partagé par les extracteurs
+            lines = [stripped for line in text.split('\n') if (stripped := line.strip())]
+            
+            name = self.extract_name(lines)
+            experience_years = self.extract_experience_zachary_fix(lines)  # 🎯 FIX V3.2.1
+            skills = self.extract_skills(text, ascii_bytes)
             sector = "Business"
             
             logger.info(f"✅ CV V3.2.1: {name} - {experience_years} ans - {len(skills)} compétences")
@@ -69,27 +287,17 @@ class EnhancedCVParserV321:
             logger.error(f"Erreur parsing: {e}")
             return CVData(name="Erreur", experience_years=0, skills=[], sector="Inconnu")
     
-    def extract_name(self, text: str) -> str:
-        """Extraction nom - focus Zachary"""
-        lines = text.split('\n')
+    def extract_name(self, lines: List[str]) -> str:
+        """Extraction nom - deux mots en majuscules en tête de CV (lignes déjà nettoyées)"""
+        for line in lines[:NAME_SEARCH_LINES]:
+            if self._name_re.match(line):
+                line_lower = line.lower()
+                if not any(bad in line_lower for bad in NAME_EXCLUDED_WORDS):
+                    return line.title()
         
-        # Chercher spécifiquement ZACHARY PARDO
-        for line in lines:
-            if 'zachary' in line.lower() and 'pardo' in line.lower():
-                return "ZACHARY PARDO"
-        
-        # Pattern majuscules amélioré
-        for line in lines:
-            line = line.strip()
-            if (line.isupper() and 
-                5 <= len(line) <= 30 and
-                len(line.split()) == 2 and  # Exactement 2 mots
-                not any(bad in line.lower() for bad in ['formation', 'experience', 'competence', 'professionnel'])):
-                return line.title()
-        
-        return "ZACHARY PARDO"  # Défaut pour Zachary
+        return "Inconnu"
     
-    def extract_experience_zachary_fix(self, text: str) -> int:
+    def extract_experience_zachary_fix(self, lines: List[str]) -> int:
         """
         🎯 FIX V3.2.1 - Extraction expérience spécifique Zachary
         
@@ -99,115 +307,132 @@ class EnhancedCVParserV321:
         - "Février-Août 2022 (6 mois)" = 6 mois
         - "2018-2021 (3 ans)" = 36 mois
         Total: 60 mois = 5 ans
+        
+        Args:
+            lines: Lignes non vides et nettoyées du CV (voir parse_cv)
         """
         
-        if not text:
+        if not lines:
             return 0
         
-        # Split en lignes pour analyse contextuelle
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines_lower = [line.lower() for line in lines]  # Une seule mise en minuscules par CV
         
-        total_months = 0
+        # Occurrences numériques : (motif, valeur, unité, début, fin, contexte)
+        kinds, nums, units, starts, ends, ctx_flags = [], [], [], [], [], []
         periods_found = []
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)  # Traces détaillées uniquement en DEBUG
         
         logger.debug(f"🔍 Analyse {len(lines)} lignes pour expérience")
         
+        # Étape 1 : regex (Python) → tuples numériques
         for i, line in enumerate(lines):
-            line_months = 0
+            first_hit = len(kinds)
             
-            # 🎯 PATTERN 1: "(X an)" ou "(X mois)" - TRÈS FIABLE
-            duration_matches = re.findall(r'\((\d+)\s+(an|ans|mois)\)', line, re.IGNORECASE)
-            for num_str, unit in duration_matches:
-                months = int(num_str) * 12 if 'an' in unit else int(num_str)
-                line_months += months
-                periods_found.append(f"{months} mois de '{line[:30]}...'")
-            
-            # 🎯 PATTERN 2: "2018-2021" - ANNÉES SEULES
-            year_matches = re.findall(r'(\d{4})\s*[-–—]\s*(\d{4})', line)
-            for start_year, end_year in year_matches:
-                start_y, end_y = int(start_year), int(end_year)
-                if 2000 <= start_y <= 2025 and 2000 <= end_y <= 2025 and end_y >= start_y:
-                    years = end_y - start_y + 1
-                    months = years * 12
-                    line_months += months
-                    periods_found.append(f"{months} mois de '{line[:30]}...'")
-            
-            # 🎯 PATTERN 3: "Avril 2023-Avril 2024" - MOIS FRANÇAIS
-            french_pattern = r'(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre|sept\.?)\s+(\d{4})\s*[-–—]\s*(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})'
-            french_matches = re.findall(french_pattern, line, re.IGNORECASE)
-            for match in french_matches:
-                # Approximation: 12 mois par défaut pour les périodes mois-mois
-                line_months += 12
-                periods_found.append(f"12 mois de '{line[:30]}...'")
+            # Un seul passage sur la ligne, dispatch selon le pattern reconnu
+            for match in self._experience_period_re.finditer(line):
+                kind = match.lastgroup
+                
+                if kind == 'duration':
+                    # 🎯 PATTERN 1: "(X an)" ou "(X mois)" - TRÈS FIABLE
+                    num_str, unit = match.group('duration_value', 'duration_unit')
+                    kinds.append(KIND_DURATION)
+                    nums.append(int(num_str))
+                    units.append(12 if 'an' in unit else 1)
+                    starts.append(0)
+                    ends.append(0)
+                
+                elif kind == 'year_range':
+                    # 🎯 PATTERN 2: "2018-2021" - ANNÉES SEULES
+                    kinds.append(KIND_YEAR_RANGE)
+                    nums.append(0)
+                    units.append(0)
+                    starts.append(int(match.group('start_year')))
+                    ends.append(int(match.group('end_year')))
+                
+                else:
+                    # 🎯 PATTERN 3: "Avril 2023-Avril 2024" - MOIS FRANÇAIS
+                    kinds.append(KIND_FRENCH_RANGE)
+                    nums.append(0)
+                    units.append(0)
+                    starts.append(0)
+                    ends.append(0)
+                
+                if debug_enabled:
+                    periods_found.append(f"{match.group(0)} de '{line[:30]}...'")
             
             # Vérifier contexte professionnel pour valider la période
-            if line_months > 0:
+            line_hits = len(kinds) - first_hit
+            if line_hits:
                 context_range = range(max(0, i-2), min(len(lines), i+3))
-                has_context = self._check_professional_context(lines, context_range, i)
+                has_context = self._check_professional_context(lines_lower, context_range, i)
+                ctx_flags.extend([has_context] * line_hits)
                 
                 if has_context:
-                    total_months += line_months
-                    logger.info(f"✅ Période validée: {line_months} mois - {line[:50]}...")
+                    logger.info(f"✅ Période validée: {line[:50]}...")
                 else:
                     logger.debug(f"❌ Période rejetée (pas de contexte): {line[:50]}...")
         
-        # Validation et calcul final
-        if total_months > 600:  # Max 50 ans
-            total_months = 600
+        # Étape 2 : accumulation numérique (bornes, contexte, plafond 50 ans)
+        total_months = accumulate_months(kinds, nums, units, starts, ends, ctx_flags)
         
         total_years = round(total_months / 12, 1)
         
         logger.info(f"📊 Expérience V3.2.1: {total_months} mois ({total_years} ans)")
-        logger.info(f"Périodes trouvées: {len(periods_found)}")
-        for period in periods_found:
-            logger.debug(f"  - {period}")
+        logger.info(f"Périodes trouvées: {len(kinds)}")
+        if debug_enabled:
+            for period in periods_found:
+                logger.debug(f"  - {period}")
         
         return total_years
     
-    def _check_professional_context(self, lines, context_range, date_line_idx):
-        """Vérifie contexte professionnel dans lignes adjacentes"""
+    def _check_professional_context(self, lines_lower, context_range, date_line_idx):
+        """Vérifie contexte professionnel dans lignes adjacentes (déjà en minuscules)"""
         
-        indicators = [
-            'assistant', 'manager', 'directeur', 'chef', 'responsable',
-            'stagiaire', 'consultant', 'analyste', 'associate',
-            'business development', 'customer experience', 'événementiel',
-            'commercial', 'marketing', 'safi', 'group', 'consultants',
-            'paris', 'france', 'usa', 'washington'
-        ]
+        # Fenêtre de contexte en un seul tampon : aucun indicateur ne contient de saut de ligne
+        window = "\n".join(
+            lines_lower[i] for i in context_range
+            if i != date_line_idx and i < len(lines_lower)
+        )
         
-        # Examiner lignes contextuelles
-        for i in context_range:
-            if i != date_line_idx and i < len(lines):
-                line_lower = lines[i].lower()
-                for indicator in indicators:
-                    if indicator in line_lower:
-                        return True
-        
-        return False
+        automaton = self._context_automaton
+        if automaton is not None:
+            # Un seul passage de l'automate, arrêt au premier indicateur trouvé
+            return any(automaton.iter(window))
+        return any(indicator in window for indicator in PROFESSIONAL_CONTEXT_INDICATORS)
     
-    def extract_skills(self, text: str) -> List[str]:
-        """Extraction compétences basique"""
+    def extract_skills(self, text: str, ascii_bytes: Optional[bytes] = None) -> List[str]:
+        """
+        Extraction compétences basique (ordre stable, sans doublons)
+        
+        Args:
+            ascii_bytes: Octets bruts du CV s'il est entièrement ASCII (voir parse_cv)
+        """
         skills = []
-        text_lower = text.lower()
+        seen = set()
         
-        # Compétences spécifiques Zachary
-        zachary_skills = [
-            "Klypso", "Hubspot", "Dynamics", "Lead Generation", "Canva",
-            "Pack Office", "CRM", "Business Development", "Customer Experience",
-            "Anglais", "Espagnol", "Allemand", "Réseaux sociaux"
-        ]
+        # Un seul parcours du texte pour toutes les compétences
+        if self._skill_automaton is not None:
+            found = {skill for _, skill in self._skill_automaton.iter(text.lower())}
+            return [skill for skill, _ in self._skill_terms if skill in found]
         
-        for skill in zachary_skills:
-            if skill.lower() in text_lower:
-                skills.append(skill)
+        if ascii_bytes is not None:
+            # Texte ASCII : seuls les motifs ASCII peuvent apparaître, sans décodage ni réencodage
+            text_lower = None
+            text_bytes = ascii_bytes.lower()
+        else:
+            # Un motif ASCII ne peut apparaître qu'aligné sur des octets ASCII en UTF-8
+            text_lower = text.lower()
+            text_bytes = text_lower.encode('utf-8', 'surrogatepass')
         
-        # Compétences génériques
-        generic_skills = ["Excel", "Word", "PowerPoint", "Marketing", "Commercial"]
-        for skill in generic_skills:
-            if skill.lower() in text_lower:
+        for skill, needle, is_ascii in self._skill_needles:
+            if not is_ascii and text_lower is None:
+                continue
+            haystack = text_bytes if is_ascii else text_lower
+            if needle in haystack and skill not in seen:
+                seen.add(skill)
                 skills.append(skill)
         
-        return list(set(skills))
+        return skills
 
 # ========================================================================================
 # 📄 EXTRACTION PDF SIMPLE
@@ -218,9 +443,8 @@ def extract_text_from_pdf(content: bytes) -> str:
     try:
         import fitz
         doc = fitz.open(stream=content, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
+        # Une seule allocation finale au lieu d'une concaténation par page
+        text = "".join(page.get_text("text") for page in doc)
         doc.close()
         return text
     except ImportError:
@@ -228,6 +452,128 @@ def extract_text_from_pdf(content: bytes) -> str:
     except Exception as e:
         return f"Erreur extraction PDF: {e}"
 
+# ========================================================================================
+# 💾 CACHE DES RÉSULTATS (par contenu de fichier)
+# ========================================================================================
+
+PARSE_CACHE_MAX_SIZE = 1024
+_parse_cache: "OrderedDict[bytes, CVData]" = OrderedDict()
+
+def content_cache_key(content: bytes, is_pdf: bool) -> bytes:
+    """Empreinte BLAKE2 du fichier (le type influe sur l'extraction)"""
+    hasher = hashlib.blake2b(content, digest_size=16)
+    hasher.update(b"pdf" if is_pdf else b"txt")
+    return hasher.digest()
+
+# Niveau partagé entre workers et instances : Redis, s'il est joignable.
+# Créé au premier usage dans chaque worker (connexion propre au processus)
+SHARED_CACHE_PREFIX = "cv:"
+_shared_cache: Optional[CacheManager] = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_cache() -> CacheManager:
+    """Cache partagé du worker (bloquant : à appeler hors de la boucle d'événements)"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = CacheManager(Config.REDIS_URL)
+        return _shared_cache
+
+def _shared_cache_disabled() -> bool:
+    """Vrai si le cache partagé est déjà connu comme simple cache mémoire (pas de Redis)"""
+    return _shared_cache is not None and _shared_cache.cache_type != 'redis'
+
+def _shared_get(key: bytes) -> Optional[Dict[str, Any]]:
+    """Lecture Redis synchrone (thread)"""
+    cache = get_shared_cache()
+    if cache.cache_type != 'redis':
+        return None
+    return cache.get(SHARED_CACHE_PREFIX + key.hex())
+
+def _shared_set(key: bytes, payload: Dict[str, Any]) -> None:
+    """Écriture Redis synchrone (thread)"""
+    cache = get_shared_cache()
+    if cache.cache_type == 'redis':
+        cache.set(SHARED_CACHE_PREFIX + key.hex(), payload, ttl=Config.CACHE_TTL_SECONDS)
+
+def _remember_parse(key: bytes, cv_data: CVData) -> None:
+    """Insère dans le LRU local en évinçant le plus ancien si nécessaire"""
+    _parse_cache[key] = cv_data
+    _parse_cache.move_to_end(key)
+    if len(_parse_cache) > PARSE_CACHE_MAX_SIZE:
+        _parse_cache.popitem(last=False)
+
+async def get_cached_parse(key: bytes) -> Optional[CVData]:
+    """Résultat déjà calculé pour ce contenu (LRU local, puis Redis hors de la boucle)"""
+    cv_data = _parse_cache.get(key)
+    if cv_data is not None:
+        _parse_cache.move_to_end(key)
+        return cv_data
+    
+    if _shared_cache_disabled():
+        return None
+    payload = await to_thread.run_sync(_shared_get, key)
+    if payload is not None:
+        cv_data = CVData(**payload)
+        _remember_parse(key, cv_data)
+    return cv_data
+
+async def store_cached_parse(key: bytes, cv_data: CVData) -> None:
+    """Mémorise un résultat localement et dans Redis (hors de la boucle)"""
+    _remember_parse(key, cv_data)
+    if not _shared_cache_disabled():
+        await to_thread.run_sync(_shared_set, key, cv_data.model_dump())
+
+# ========================================================================================
+# ⚙️ POOL DE PROCESSUS (traitement par lot)
+# ========================================================================================
+
+def process_pool_size() -> int:
+    """Taille du pool par worker uvicorn : les cœurs sont partagés entre workers"""
+    configured = os.getenv("PARSER_PROCESS_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    web_workers = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+    return max(1, (os.cpu_count() or 1) // web_workers)
+
+# Créé au démarrage du worker (start_process_pool), avant tout thread
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def _noop() -> None:
+    """Tâche vide : force le fork des processus du pool au démarrage"""
+
+def parse_file_content(content: bytes, is_pdf: bool) -> CVData:
+    """Extraction + parsing d'un fichier (thread ou processus du pool)"""
+    if is_pdf:
+        return cv_parser.parse_cv(extract_text_from_pdf(content))
+    # Texte brut : octets passés tels quels, décodés par le parser
+    return cv_parser.parse_cv(content)
+
+# ========================================================================================
+# 📥 LECTURE DES UPLOADS
+# ========================================================================================
+
+MAX_UPLOAD_SIZE = 20 * 1024 * 1024  # 20 Mo
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Lots /parse_cv_batch : nombre de fichiers par requête, et fichiers en mémoire
+# simultanément dans le worker (au plus BATCH_CONCURRENCY × MAX_UPLOAD_SIZE)
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "20"))
+BATCH_CONCURRENCY = int(os.getenv("PARSER_BATCH_CONCURRENCY", "4"))
+_batch_semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+async def read_upload(file: UploadFile) -> bytes:
+    """Lecture par blocs avec plafond de taille (413 dès le dépassement)"""
+    if file.size is not None and file.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="Fichier trop volumineux")
+    
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buffer.extend(chunk)
+        if len(buffer) > MAX_UPLOAD_SIZE:
+            raise HTTPException(status_code=413, detail="Fichier trop volumineux")
+    return bytes(buffer)
+
 # ========================================================================================
 # 🚀 ENDPOINTS API
 # ========================================================================================
@@ -235,47 +581,55 @@ def extract_text_from_pdf(content: bytes) -> str:
 # Instance parser
 cv_parser = EnhancedCVParserV321()
 
+# Réponses statiques sérialisées une seule fois, à l'import
+_ROOT_RESPONSE = orjson.dumps({
+    "service": "SuperSmartMatch V3.2.1 Enhanced",
+    "version": "3.2.1", 
+    "fix": "Zachary experience extraction: 0→4 years ✅",
+    "performance": {
+        "accuracy": "88.5%",
+        "response_time": "12.3ms",
+        "improvement": "+392% vs initial"
+    },
+    "achievements": [
+        "🎯 Zachary experience: 0→4 years solved",
+        "🔍 16 skills detected perfectly", 
+        "📊 Contextual multi-line parsing",
+        "✅ Business sector identification",
+        "🚀 PDF extraction functional"
+    ],
+    "endpoints": {
+        "parse_cv": "POST /parse_cv",
+        "parse_cv_batch": "POST /parse_cv_batch",
+        "test_enhanced": "GET /test_enhanced", 
+        "health": "GET /health"
+    }
+})
+
 @app.get("/")
 async def root():
-    return {
-        "service": "SuperSmartMatch V3.2.1 Enhanced",
-        "version": "3.2.1", 
-        "fix": "Zachary experience extraction: 0→4 years ✅",
-        "performance": {
-            "accuracy": "88.5%",
-            "response_time": "12.3ms",
-            "improvement": "+392% vs initial"
-        },
-        "achievements": [
-            "🎯 Zachary experience: 0→4 years solved",
-            "🔍 16 skills detected perfectly", 
-            "📊 Contextual multi-line parsing",
-            "✅ Business sector identification",
-            "🚀 PDF extraction functional"
-        ],
-        "endpoints": {
-            "parse_cv": "POST /parse_cv",
-            "test_enhanced": "GET /test_enhanced", 
-            "health": "GET /health"
-        }
-    }
+    return Response(content=_ROOT_RESPONSE, media_type="application/json")
 
 @app.post("/parse_cv")
-async def parse_cv_endpoint(file: UploadFile = File(...)):
+async def parse_cv_endpoint(response: Response, file: UploadFile = File(...)):
     """Parse CV avec fix V3.2.1"""
     try:
-        content = await file.read()
+        content = await read_upload(file)
+        is_pdf = file.filename.lower().endswith('.pdf')
+        cache_key = content_cache_key(content, is_pdf)
         
-        if file.filename.lower().endswith('.pdf'):
-            text = extract_text_from_pdf(content)
-        else:
-            text = content.decode('utf-8')
+        # Fichier déjà analysé (LRU local ou Redis) : pas de nouvelle extraction
+        cv_data = await get_cached_parse(cache_key)
+        response.headers["X-Cache"] = "HIT" if cv_data is not None else "MISS"
         
-        cv_data = cv_parser.parse_cv(text)
+        if cv_data is None:
+            # Extraction PDF (C synchrone) et parsing hors de la boucle d'événements
+            cv_data = await to_thread.run_sync(parse_file_content, content, is_pdf)
+            await store_cached_parse(cache_key, cv_data)
         
         return {
             "success": True,
-            "cv_data": cv_data.dict(),
+            "cv_data": cv_data.model_dump(),
             "parser_version": "V3.2.1_Enhanced_Fixed",
             "zachary_fix": "Experience extraction enhanced ✅",
             "performance": {
@@ -285,9 +639,73 @@ async def parse_cv_endpoint(file: UploadFile = File(...)):
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _parse_batch_item(file: UploadFile) -> Dict[str, Any]:
+    """Parse un fichier du lot : cache, sinon pool de processus"""
+    async with _batch_semaphore:
+        return await _parse_upload(file)
+
+async def _parse_upload(file: UploadFile) -> Dict[str, Any]:
+    """Lecture, cache puis parsing d'un fichier du lot"""
+    content = await read_upload(file)
+    is_pdf = file.filename.lower().endswith('.pdf')
+    
+    cache_key = content_cache_key(content, is_pdf)
+    cv_data = await get_cached_parse(cache_key)
+    
+    if cv_data is None:
+        if _process_pool is not None:
+            loop = asyncio.get_running_loop()
+            cv_data = await loop.run_in_executor(_process_pool, parse_file_content, content, is_pdf)
+        else:
+            cv_data = await to_thread.run_sync(parse_file_content, content, is_pdf)
+        await store_cached_parse(cache_key, cv_data)
+    
+    return {"filename": file.filename, "cv_data": cv_data.model_dump()}
+
+@app.post("/parse_cv_batch")
+async def parse_cv_batch_endpoint(files: List[UploadFile] = File(...)):
+    """Parse un lot de CV en parallèle (un processus par cœur)"""
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=413, detail=f"Lot limité à {MAX_BATCH_FILES} fichiers")
+    
+    try:
+        results = await asyncio.gather(*(_parse_batch_item(file) for file in files))
+        
+        return {
+            "success": True,
+            "count": len(results),
+            "results": results,
+            "parser_version": "V3.2.1_Enhanced_Fixed"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.on_event("startup")
+async def start_process_pool():
+    """Crée le pool de processus au démarrage du worker, avant tout thread"""
+    global _process_pool
+    mp_context = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else None
+    if mp_context is not None:
+        # Automates compilés une seule fois ici, hérités en copie sur écriture par les workers
+        cv_parser.warm_up()
+    _process_pool = ProcessPoolExecutor(max_workers=process_pool_size(), mp_context=mp_context)
+    # Fork immédiat des processus (tâche vide), pas au premier lot
+    _process_pool.submit(_noop).result()
+
+@app.on_event("shutdown")
+async def shutdown_process_pool():
+    """Libère le pool de processus à l'arrêt du worker"""
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+
 @app.get("/test_enhanced")
 async def test_enhanced():
     """Test avec données Zachary simulées"""
@@ -351,59 +769,65 @@ async def test_enhanced():
     except Exception as e:
         return {"test": "Zachary Fix V3.2.1", "success": False, "error": str(e)}
 
+_HEALTH_TEMPLATE = orjson.dumps({
+    "status": "healthy",
+    "version": "3.2.1", 
+    "zachary_fix": "Experience extraction enhanced ✅",
+    "performance": {
+        "accuracy": "88.5%",
+        "response_time": "12.3ms",
+        "uptime": "operational"
+    },
+    "achievements": {
+        "critical_problem_solved": "Zachary 0→4 years ✅",
+        "skills_detection": "16 skills detected ✅",
+        "pdf_parsing": "Functional ✅",
+        "contextual_extraction": "Multi-line patterns ✅"
+    },
+    "timestamp": "__TIMESTAMP__"
+})
+
 @app.get("/health")
 async def health():
-    return {
-        "status": "healthy",
-        "version": "3.2.1", 
-        "zachary_fix": "Experience extraction enhanced ✅",
-        "performance": {
-            "accuracy": "88.5%",
-            "response_time": "12.3ms",
-            "uptime": "operational"
-        },
-        "achievements": {
-            "critical_problem_solved": "Zachary 0→4 years ✅",
-            "skills_detection": "16 skills detected ✅",
-            "pdf_parsing": "Functional ✅",
-            "contextual_extraction": "Multi-line patterns ✅"
-        },
-        "timestamp": datetime.now().isoformat()
-    }
+    # Seul l'horodatage varie : substitution dans les octets pré-rendus
+    timestamp = datetime.now().isoformat().encode()
+    return Response(content=_HEALTH_TEMPLATE.replace(b"__TIMESTAMP__", timestamp), media_type="application/json")
+
+_STATS_RESPONSE = orjson.dumps({
+    "service": "SuperSmartMatch V3.2.1 Enhanced",
+    "problem_solved": "Zachary experience extraction: 0→4 years",
+    "performance_metrics": {
+        "accuracy": "88.5%",
+        "response_time": "12.3ms", 
+        "improvement_vs_initial": "+392%",
+        "zero_critical_errors": True
+    },
+    "technical_achievements": {
+        "patterns_implemented": 4,
+        "contextual_validation": True,
+        "multi_line_parsing": True,
+        "french_date_support": True,
+        "pdf_extraction": "PyMuPDF",
+        "api_framework": "FastAPI + Pydantic"
+    },
+    "validation_results": {
+        "zachary_simulation": "11 years detected",
+        "zachary_real_pdf": "4 years detected ✅",
+        "skills_detected": 16,
+        "sector_identification": "Business ✅"
+    },
+    "patterns_detected": [
+        "(X an|mois) - explicit duration",
+        "YYYY-YYYY - year ranges",
+        "Mois YYYY-Mois YYYY - French months", 
+        "Mois-Mois YYYY - same year ranges"
+    ]
+})
 
 @app.get("/stats")
 async def get_stats():
     """📊 Statistiques performance V3.2.1"""
-    return {
-        "service": "SuperSmartMatch V3.2.1 Enhanced",
-        "problem_solved": "Zachary experience extraction: 0→4 years",
-        "performance_metrics": {
-            "accuracy": "88.5%",
-            "response_time": "12.3ms", 
-            "improvement_vs_initial": "+392%",
-            "zero_critical_errors": True
-        },
-        "technical_achievements": {
-            "patterns_implemented": 4,
-            "contextual_validation": True,
-            "multi_line_parsing": True,
-            "french_date_support": True,
-            "pdf_extraction": "PyMuPDF",
-            "api_framework": "FastAPI + Pydantic"
-        },
-        "validation_results": {
-            "zachary_simulation": "11 years detected",
-            "zachary_real_pdf": "4 years detected ✅",
-            "skills_detected": 16,
-            "sector_identification": "Business ✅"
-        },
-        "patterns_detected": [
-            "(X an|mois) - explicit duration",
-            "YYYY-YYYY - year ranges",
-            "Mois YYYY-Mois YYYY - French months", 
-            "Mois-Mois YYYY - same year ranges"
-        ]
-    }
+    return Response(content=_STATS_RESPONSE, media_type="application/json")
 
 if __name__ == "__main__":
     logger.info("🚀 SuperSmartMatch V3.2.1 Enhanced - Fix Zachary")
@@ -411,9 +835,19 @@ if __name__ == "__main__":
     logger.info("🎯 Performance: 88.5% accuracy, 12.3ms response")
     logger.info("🔍 Features: Multi-line parsing, French patterns, PDF extraction")
     
+    # Rechargement auto en dev uniquement : il impose un seul worker
+    debug_mode = os.getenv("DEBUG", "False").lower() == "true"
+    workers = 1 if debug_mode else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    # Transmis aux workers : dimensionnement du pool de processus par worker
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    
+    # Serveur ASGI : uvloop (boucle libuv) + httptools (parseur HTTP en C)
     uvicorn.run(
         "app_simple_fixed_v321:app",
         host="0.0.0.0", 
         port=5067,
-        reload=True
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        reload=debug_mode
     )
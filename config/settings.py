@@ -25,6 +25,8 @@ class Config:
     
     # Limites et performances
     MAX_JOBS_PER_REQUEST = int(os.getenv('MAX_JOBS_PER_REQUEST', '1000'))
+    MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '50'))  # Requêtes par appel /match/batch
+    MAX_BATCH_TOTAL_JOBS = int(os.getenv('MAX_BATCH_TOTAL_JOBS', '5000'))  # Offres cumulées par lot
     MAX_EXECUTION_TIME_SECONDS = int(os.getenv('MAX_EXECUTION_TIME_SECONDS', '30'))
     CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', '3600'))
     
@@ -150,6 +152,8 @@ class TestingConfig(Config):
     CACHE_TTL_SECONDS = 60  # Cache très court pour tests
     REDIS_URL = None  # Pas de Redis en test
     MAX_JOBS_PER_REQUEST = 10  # Très limité pour tests
+    MAX_BATCH_SIZE = 5
+    MAX_BATCH_TOTAL_JOBS = 50
 
 # Configuration par environnement
 config_by_env = {
@@ -6,10 +6,110 @@ Diagnostique pourquoi tous les scores sont à 0%
 
 import os
 import json
+import asyncio
 import requests
 import re
+from collections import Counter
+from enum import IntEnum
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import pdfplumber
+import fitz  # PyMuPDF
+
+# Automate Aho-Corasick (pyahocorasick) si disponible
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Scores par secteur vectorisés (NumPy) si disponible
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# PCRE2 compilé en JIT (API compatible re) si disponible, sinon module re
+try:
+    import pcre2 as experience_regex
+except ImportError:
+    experience_regex = re
+
+# Mots-clés par secteur (détection)
+SECTEUR_KEYWORDS = {
+    "commercial": ["vente", "commercial", "vendeur", "business", "client"],
+    "juridique": ["droit", "juridique", "avocat", "juriste", "contrat"],
+    "comptabilite": ["comptable", "comptabilité", "bilan", "fiscalité", "audit"],
+    "informatique": ["développeur", "programmeur", "python", "javascript", "sql"],
+    "management": ["manager", "directeur", "chef", "équipe", "leadership"],
+    "rh": ["ressources humaines", "recrutement", "paie", "formation", "rh"],
+    "finance": ["finance", "financier", "trésorerie", "budget"],
+}
+
+# Identifiant entier stable de chaque secteur (ordre de SECTEUR_KEYWORDS)
+Secteur = IntEnum('Secteur', [(secteur.upper(), index) for index, secteur in enumerate(SECTEUR_KEYWORDS)])
+ID_TO_SECTEUR = tuple(SECTEUR_KEYWORDS)
+
+# Paires (mot-clé, id secteur) à plat, pour sommer les scores par secteur
+SECTEUR_KEYWORD_LIST = tuple(keyword for keywords in SECTEUR_KEYWORDS.values() for keyword in keywords)
+SECTEUR_KEYWORD_IDS = tuple(
+    Secteur[secteur.upper()] for secteur, keywords in SECTEUR_KEYWORDS.items() for _ in keywords
+)
+if np is not None:
+    SECTEUR_KEYWORD_IDS = np.array(SECTEUR_KEYWORD_IDS, dtype=np.intp)
+
+# Mots-clés de compétences par secteur (extraction)
+COMPETENCES_KEYWORDS = {
+    "comptabilite": ["comptable", "comptabilité", "bilan", "fiscalité", "audit", "sage", "excel"],
+    "juridique": ["droit", "juridique", "avocat", "contrat", "legal"],
+    "commercial": ["vente", "commercial", "crm", "prospection"],
+    "informatique": ["python", "javascript", "sql", "développement"],
+    "management": ["management", "équipe", "leadership", "gestion"],
+}
+
+# Tous les mots-clés (secteurs + compétences), sans doublons
+ALL_KEYWORDS = tuple(dict.fromkeys(
+    keyword
+    for table in (SECTEUR_KEYWORDS, COMPETENCES_KEYWORDS)
+    for keywords in table.values()
+    for keyword in keywords
+))
+
+def _build_keyword_automaton():
+    """Construit l'automate Aho-Corasick des mots-clés (None si absent)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword_id, keyword in enumerate(ALL_KEYWORDS):
+        automaton.add_word(keyword, keyword_id)
+    automaton.make_automaton()
+    return automaton
+
+KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# Repli sans Aho-Corasick : une seule alternation en lookahead, qui compte aussi
+# les occurrences qui se chevauchent (comme l'automate)
+KEYWORD_RE = re.compile('(?=(' + '|'.join(
+    re.escape(keyword) for keyword in sorted(ALL_KEYWORDS, key=len, reverse=True)
+) + '))')
+
+def count_keywords(text_lower):
+    """Occurrences de chaque mot-clé en un seul passage sur le texte (déjà en minuscules)"""
+    if KEYWORD_AUTOMATON is None:
+        return Counter(KEYWORD_RE.findall(text_lower))
+    
+    # Un seul parcours O(|texte|), chevauchements inclus
+    counts = Counter(keyword_id for _, keyword_id in KEYWORD_AUTOMATON.iter(text_lower))
+    return {ALL_KEYWORDS[keyword_id]: count for keyword_id, count in counts.items()}
+
+# Patterns d'expérience fusionnés, par ordre de priorité : ancrée en début de
+# texte, l'alternation n'essaie un pattern que si les précédents n'apparaissent
+# nulle part (même résultat que trois recherches successives, en un seul appel)
+EXPERIENCE_RE = experience_regex.compile(
+    r"^(?:.*?(?P<ans>\d+)\s*an[s]?\s*(?:d'|de)?\s*(?:exp[eé]rience)?"
+    r"|.*?(?P<annees>\d+)\s*années?\s*d'exp[eé]rience"
+    r"|.*?exp[eé]rience\s*:\s*(?P<libelle>\d+))",
+    experience_regex.DOTALL
+)
 
 def debug_api_response():
     """Teste l'API avec des données simples pour vérifier le fonctionnement"""
@@ -70,6 +170,16 @@ def debug_api_response():
     except Exception as e:
         print(f"❌ Erreur connexion: {e}")
 
+@lru_cache(maxsize=16)
+def _list_pdfs_cached(folder, mtime_ns):
+    """Noms des PDF d'un dossier (un seul parcours os.scandir, sans stat par fichier)"""
+    with os.scandir(folder) as entries:
+        return tuple(entry.name for entry in entries if entry.name.endswith('.pdf'))
+
+def list_pdfs(folder):
+    """Noms des PDF d'un dossier, mis en cache tant que le dossier n'est pas modifié"""
+    return _list_pdfs_cached(folder, os.stat(folder).st_mtime_ns)
+
 def test_real_files():
     """Teste avec de vrais fichiers pour voir le parsing"""
     
@@ -81,52 +191,112 @@ def test_real_files():
     job_folder = "/Users/baptistecomas/Desktop/FDP TEST/"
     
     # Test sur un CV et une fiche de poste
-    cv_files = [f for f in os.listdir(cv_folder) if f.endswith('.pdf')][:1]
-    job_files = [f for f in os.listdir(job_folder) if f.endswith('.pdf')][:1]
+    cv_files = list_pdfs(cv_folder)[:1]
+    job_files = list_pdfs(job_folder)[:1]
     
     if cv_files and job_files:
         print(f"📄 Test CV: {cv_files[0]}")
         print(f"📋 Test Job: {job_files[0]}")
         
-        # Parse le CV
         cv_path = os.path.join(cv_folder, cv_files[0])
-        cv_data = parse_file_debug(cv_path, "CV")
-        
-        # Parse la fiche de poste
         job_path = os.path.join(job_folder, job_files[0])
-        job_data = parse_file_debug(job_path, "Job")
+        
+        # Parse le CV et la fiche de poste en parallèle
+        cv_data, job_data = asyncio.run(parse_files_debug([(cv_path, "CV"), (job_path, "Job")]))
         
         if cv_data and job_data:
             # Test du matching
             test_real_matching(cv_data, job_data)
 
-def parse_file_debug(file_path, file_type):
-    """Parse un fichier et affiche les détails"""
+def _read_bytes(path):
+    """Contenu du fichier, None si illisible (l'erreur sera signalée au parsing)"""
+    try:
+        return Path(path).read_bytes()
+    except OSError:
+        return None
+
+def read_files_batch(paths):
+    """Lit tous les fichiers en mémoire en un lot (lectures parallèles)"""
+    with ThreadPoolExecutor(max_workers=min(32, len(paths) or 1)) as pool:
+        return list(pool.map(_read_bytes, paths))
+
+async def parse_file_debug_async(file_path, file_type, content=None):
+    """Parse un fichier dans un thread (extraction PDF bloquante)"""
+    return await asyncio.to_thread(parse_file_debug, file_path, file_type, content)
+
+async def parse_files_debug(files):
+    """Parse plusieurs fichiers (chemin, type) en parallèle, résultats dans l'ordre"""
+    # Toutes les lectures disque d'abord, puis extraction depuis la mémoire
+    contents = await asyncio.to_thread(read_files_batch, [path for path, _ in files])
+    return await asyncio.gather(*(
+        parse_file_debug_async(path, file_type, content)
+        for (path, file_type), content in zip(files, contents)
+    ))
+
+# Arrêt anticipé de l'extraction PDF : secteur confirmé, compétences et expérience trouvées
+EARLY_EXIT_SECTOR_SCORE = 5
+EARLY_EXIT_MIN_SKILLS = 3
+
+def pdf_pages(file_path, content=None):
+    """Générateur du texte de chaque page (content : octets déjà lus, optionnel)"""
+    source = fitz.open(stream=content, filetype="pdf") if content is not None else fitz.open(file_path)
+    with source as doc:
+        for page in doc:
+            yield page.get_text("text")
+
+def _analysis_resolved(keyword_counts, years):
+    """Vrai si les pages déjà lues suffisent (secteur, compétences et expérience)"""
+    if years is None:
+        return False
+    scores = _secteur_scores([keyword_counts.get(keyword, 0) for keyword in SECTEUR_KEYWORD_LIST])
+    best = _best_secteur_id(scores)
+    if scores[best] < EARLY_EXIT_SECTOR_SCORE:
+        return False
+    secteur = ID_TO_SECTEUR[best]
+    skills = sum(1 for keyword in COMPETENCES_KEYWORDS.get(secteur, []) if keyword_counts.get(keyword))
+    return skills >= EARLY_EXIT_MIN_SKILLS
+
+def parse_file_debug(file_path, file_type, content=None):
+    """Parse un fichier et affiche les détails (content : octets déjà lus, optionnel)"""
     
     print(f"\n📖 Parsing {file_type}: {Path(file_path).name}")
     
     try:
-        # Extraction texte
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+        # Extraction page par page (PyMuPDF) avec scan incrémental des mots-clés :
+        # aucun mot-clé ne contient de saut de ligne, les comptes par page s'additionnent.
+        # Chaque page n'est mise en minuscules qu'une fois (text_lower partagé)
+        pages = []
+        keyword_counts = Counter()
+        text_lower = ""
+        years = None
+        for page_text in pdf_pages(file_path, content):
+            page_lower = page_text.lower()
+            keyword_counts.update(count_keywords(page_lower))
+            if pages:
+                text_lower += "\n"
+            search_from = len(text_lower)
+            text_lower += page_lower
+            pages.append(page_text)
+            if years is None:
+                years = _fast_years(text_lower, search_from)
+            if _analysis_resolved(keyword_counts, years):
+                print(f"⏩ Arrêt anticipé après {len(pages)} page(s)")
+                break
+        text = "\n".join(pages)
         
         print(f"📝 Texte extrait: {len(text)} caractères")
         print(f"🔍 Aperçu: {text[:200]}...")
         
         # Détection secteur
-        secteur = detect_secteur_debug(text)
+        secteur = detect_secteur_debug(text, keyword_counts)
         print(f"🎯 Secteur détecté: {secteur}")
         
         # Extraction compétences
-        competences = extract_competences_debug(text, secteur)
+        competences = extract_competences_debug(text, secteur, keyword_counts)
         print(f"🛠️ Compétences: {competences}")
         
-        # Extraction expérience
-        experience = extract_experience_debug(text)
+        # Extraction expérience (déjà trouvée par le chemin rapide pendant la lecture)
+        experience = years if years is not None else extract_experience_debug(text, text_lower)
         print(f"⏰ Expérience: {experience} ans")
         
         if file_type == "CV":
@@ -150,75 +320,92 @@ def parse_file_debug(file_path, file_type):
         print(f"❌ Erreur parsing: {e}")
         return None
 
-def detect_secteur_debug(text):
-    """Détection de secteur avec debug"""
-    
-    secteur_keywords = {
-        "commercial": ["vente", "commercial", "vendeur", "business", "client"],
-        "juridique": ["droit", "juridique", "avocat", "juriste", "contrat"],
-        "comptabilite": ["comptable", "comptabilité", "bilan", "fiscalité", "audit"],
-        "informatique": ["développeur", "programmeur", "python", "javascript", "sql"],
-        "management": ["manager", "directeur", "chef", "équipe", "leadership"],
-        "rh": ["ressources humaines", "recrutement", "paie", "formation", "rh"],
-        "finance": ["finance", "financier", "trésorerie", "budget"],
-    }
-    
-    text_lower = text.lower()
-    secteur_scores = {}
+def _secteur_scores(counts):
+    """Score de chaque secteur (indexé par Secteur) à partir des comptes de SECTEUR_KEYWORD_LIST"""
+    if np is None:
+        scores = [0] * len(ID_TO_SECTEUR)
+        for secteur_id, count in zip(SECTEUR_KEYWORD_IDS, counts):
+            scores[secteur_id] += count
+        return scores
+    scores = np.zeros(len(ID_TO_SECTEUR), dtype=np.int32)
+    np.add.at(scores, SECTEUR_KEYWORD_IDS, counts)
+    return scores
+
+def _best_secteur_id(scores):
+    """Premier maximum, comme max() sur les secteurs dans l'ordre de déclaration"""
+    if np is None:
+        return max(range(len(scores)), key=scores.__getitem__)
+    return int(scores.argmax())
+
+def detect_secteur_debug(text, keyword_counts=None):
+    """Détection de secteur avec debug (keyword_counts : résultat de count_keywords)"""
     
-    for secteur, keywords in secteur_keywords.items():
-        score = 0
-        found_keywords = []
-        for keyword in keywords:
-            count = text_lower.count(keyword)
-            if count > 0:
-                score += count
-                found_keywords.append(f"{keyword}({count})")
-        secteur_scores[secteur] = {"score": score, "keywords": found_keywords}
+    if keyword_counts is None:
+        keyword_counts = count_keywords(text.lower())
+    counts = [keyword_counts.get(keyword, 0) for keyword in SECTEUR_KEYWORD_LIST]
+    scores = _secteur_scores(counts)
     
+    # Affichage debug : mots-clés trouvés par secteur
+    secteur_scores = {secteur: {"score": int(scores[secteur_id]), "keywords": []}
+                      for secteur_id, secteur in enumerate(ID_TO_SECTEUR)}
+    for keyword, secteur_id, count in zip(SECTEUR_KEYWORD_LIST, SECTEUR_KEYWORD_IDS, counts):
+        if count > 0:
+            secteur_scores[ID_TO_SECTEUR[secteur_id]]["keywords"].append(f"{keyword}({count})")
     print(f"🔍 Scores secteurs: {secteur_scores}")
     
-    best_secteur = max(secteur_scores.items(), key=lambda x: x[1]["score"])
-    return best_secteur[0] if best_secteur[1]["score"] > 0 else "commercial"
+    best = _best_secteur_id(scores)
+    return ID_TO_SECTEUR[best] if scores[best] > 0 else "commercial"
 
-def extract_competences_debug(text, secteur):
-    """Extraction compétences avec debug"""
-    
-    secteur_keywords = {
-        "comptabilite": ["comptable", "comptabilité", "bilan", "fiscalité", "audit", "sage", "excel"],
-        "juridique": ["droit", "juridique", "avocat", "contrat", "legal"],
-        "commercial": ["vente", "commercial", "crm", "prospection"],
-        "informatique": ["python", "javascript", "sql", "développement"],
-        "management": ["management", "équipe", "leadership", "gestion"],
-    }
+def extract_competences_debug(text, secteur, keyword_counts=None):
+    """Extraction compétences avec debug (keyword_counts : résultat de count_keywords)"""
     
+    if keyword_counts is None:
+        keyword_counts = count_keywords(text.lower())
     competences = []
-    keywords = secteur_keywords.get(secteur, [])
+    keywords = COMPETENCES_KEYWORDS.get(secteur, [])
     
     for keyword in keywords:
-        if keyword.lower() in text.lower():
+        if keyword_counts.get(keyword):
             competences.append(keyword.title())
     
     return competences[:5] if competences else ["Polyvalent"]
 
-def extract_experience_debug(text):
-    """Extraction expérience avec debug"""
+def _fast_years(text_lower, start=0):
+    """
+    Chemin rapide du premier pattern d'expérience ("<nombre> an(s)")
+    
+    Repère "an" avec str.find à partir de start, puis remonte les espaces et les
+    chiffres qui le précèdent. Retourne None si le pattern n'apparaît pas.
+    """
+    find = text_lower.find
+    index = find('an', start)
+    while index != -1:
+        end = index
+        while end > 0 and text_lower[end - 1].isspace():
+            end -= 1
+        start = end
+        while start > 0 and text_lower[start - 1].isdecimal():
+            start -= 1
+        if start < end:
+            return int(text_lower[start:end])
+        index = find('an', index + 1)
+    return None
+
+def extract_experience_debug(text, text_lower=None):
+    """Extraction expérience avec debug (text_lower : texte déjà en minuscules, optionnel)"""
     
-    patterns = [
-        r'(\d+)\s*an[s]?\s*(?:d\'|de)?\s*(?:exp[eé]rience)?',
-        r'(\d+)\s*années?\s*d\'exp[eé]rience',
-        r'exp[eé]rience\s*:\s*(\d+)',
-    ]
+    if text_lower is None:
+        text_lower = text.lower()
     
-    text_lower = text.lower()
+    # Cas courant "<nombre> ans" : pas de moteur regex
+    years = _fast_years(text_lower)
+    if years is not None:
+        return years
     
-    for pattern in patterns:
-        matches = re.findall(pattern, text_lower)
-        if matches:
-            try:
-                return int(matches[0]) if matches[0].isdigit() else 0
-            except:
-                continue
+    match = EXPERIENCE_RE.match(text_lower)
+    if match:
+        value = match.group('ans') or match.group('annees') or match.group('libelle')
+        return int(value) if value.isdigit() else 0
     
     return 0
 
@@ -5,7 +5,44 @@ Diagnostique rapide pourquoi tous les scores sont à 0%
 """
 
 import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Réduction des scores en C (NumPy) si disponible
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Délais (connexion, lecture) en secondes : un service arrêté échoue en moins d'une seconde
+REQUEST_TIMEOUT = (0.5, 5)
+# Au-delà de cette durée (secondes), la réponse est signalée comme lente
+SLOW_REQUEST_S = 1.0
+
+# Session HTTP partagée : connexion keep-alive réutilisée par tous les appels,
+# relances courtes sur erreurs de passerelle (le dernier statut est conservé)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.1,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False
+    )
+))
+
+def post(url, **kwargs):
+    """POST via la session partagée avec délais courts ; signale les réponses lentes"""
+    response = SESSION.post(url, timeout=REQUEST_TIMEOUT, **kwargs)
+    elapsed = response.elapsed.total_seconds()
+    if elapsed > SLOW_REQUEST_S:
+        print(f"   🐢 Réponse lente : {elapsed:.1f}s ({url})")
+    return response
 
 def test_api_simple():
     """Test simple de l'API pour identifier le problème"""
@@ -14,9 +51,6 @@ def test_api_simple():
     print("=" * 60)
     
     # Test 1: Données parfaitement compatibles
-    print("\n🧪 TEST 1: Candidat et poste identiques")
-    print("-" * 40)
-    
     test_perfect_match = {
         "candidate": {
             "competences": ["Comptabilité", "Excel", "Sage"],
@@ -35,12 +69,7 @@ def test_api_simple():
         "options": {"include_details": True}
     }
     
-    result1 = call_api(test_perfect_match, "Match parfait")
-    
     # Test 2: Données moyennement compatibles
-    print("\n🧪 TEST 2: Candidat et poste partiellement compatibles")
-    print("-" * 40)
-    
     test_partial_match = {
         "candidate": {
             "competences": ["Commercial", "Vente"],
@@ -58,12 +87,7 @@ def test_api_simple():
         "options": {"include_details": True}
     }
     
-    result2 = call_api(test_partial_match, "Match partiel")
-    
     # Test 3: Données incompatibles
-    print("\n🧪 TEST 3: Candidat et poste incompatibles")
-    print("-" * 40)
-    
     test_no_match = {
         "candidate": {
             "competences": ["Développement", "Python", "SQL"],
@@ -81,12 +105,7 @@ def test_api_simple():
         "options": {"include_details": True}
     }
     
-    result3 = call_api(test_no_match, "Aucun match")
-    
     # Test 4: Avec vos vraies fiches de poste
-    print("\n🧪 TEST 4: Avec les titres de vos vraies fiches")
-    print("-" * 40)
-    
     test_real_jobs = {
         "candidate": {
             "competences": ["Comptabilité", "Excel", "Sage", "Bilan"],
@@ -121,22 +140,26 @@ def test_api_simple():
         "options": {"include_details": True}
     }
     
-    result4 = call_api(test_real_jobs, "Vraies fiches de poste")
+    # Les quatre tests partent en une seule requête HTTP
+    results = call_api_bulk([
+        ("🧪 TEST 1: Candidat et poste identiques", test_perfect_match, "Match parfait"),
+        ("🧪 TEST 2: Candidat et poste partiellement compatibles", test_partial_match, "Match partiel"),
+        ("🧪 TEST 3: Candidat et poste incompatibles", test_no_match, "Aucun match"),
+        ("🧪 TEST 4: Avec les titres de vos vraies fiches", test_real_jobs, "Vraies fiches de poste"),
+    ])
     
     # Analyse des résultats
     print("\n" + "=" * 60)
     print("📊 ANALYSE DES RÉSULTATS")
     print("=" * 60)
     
-    results = [result1, result2, result3, result4]
     test_names = ["Match parfait", "Match partiel", "Aucun match", "Vraies fiches"]
     
     all_zero = True
     for i, (result, name) in enumerate(zip(results, test_names)):
         if result:
-            scores = extract_scores(result)
-            max_score = max(scores) if scores else 0
-            print(f"📋 {name}: Score max = {max_score}%")
+            max_score = max_score_of(extract_scores(result))
+            print(f"📋 {name}: Score max = {max_score:g}%")
             if max_score > 0:
                 all_zero = False
         else:
@@ -158,41 +181,92 @@ def test_api_simple():
     else:
         print("\n✅ L'API fonctionne partiellement")
 
+API_URL = "http://localhost:5061/api/v1/match"
+BATCH_API_URL = "http://localhost:5061/api/v1/match/batch"
+STREAM_API_URL = "http://localhost:5061/api/v1/match/stream"
+
+def print_request(payload, test_name):
+    """Affiche le résumé d'une requête de test"""
+    print(f"📤 Test: {test_name}")
+    print(f"📝 Candidat: {payload['candidate']['secteur']} - {payload['candidate']['competences']}")
+    print(f"📋 Jobs: {len(payload['jobs'])} poste(s)")
+
+def print_match(i, match):
+    """Affiche le score d'un match"""
+    score = match.get("score", 0)
+    job_info = match.get("job", {})
+    job_titre = job_info.get("titre", f"Job {i+1}")
+    print(f"   🎯 {job_titre}: {score}%")
+    
+    if score == 0:
+        details = match.get("details", "")
+        if details:
+            print(f"      💡 Détails: {details}")
+
+def print_result(result):
+    """Affiche les scores d'un résultat de matching"""
+    if "matches" in result:
+        for i, match in enumerate(result["matches"]):
+            print_match(i, match)
+    else:
+        print(f"   ❌ Pas de clé 'matches' dans la réponse")
+        print(f"   📄 Réponse: {result}")
+
+def _ndjson_body(payload):
+    """Corps NDJSON envoyé par morceaux : en-tête (candidat, options) puis une offre par ligne"""
+    header = {key: value for key, value in payload.items() if key != "jobs"}
+    yield orjson.dumps(header) + b"\n"
+    for job in payload["jobs"]:
+        yield orjson.dumps(job) + b"\n"
+
 def call_api(payload, test_name):
-    """Appelle l'API et retourne le résultat"""
+    """
+    Appelle l'API et retourne le résultat
+    
+    Les offres partent en NDJSON vers /api/v1/match/stream et chaque match est
+    affiché dès sa réception. Repli sur /api/v1/match si l'endpoint est absent.
+    """
     
     try:
-        print(f"📤 Test: {test_name}")
-        print(f"📝 Candidat: {payload['candidate']['secteur']} - {payload['candidate']['competences']}")
-        print(f"📋 Jobs: {len(payload['jobs'])} poste(s)")
+        print_request(payload, test_name)
         
-        response = requests.post(
-            "http://localhost:5061/api/v1/match",
-            json=payload,
-            timeout=10
+        # Corps NDJSON matérialisé : rejouable en cas de relance
+        response = post(
+            STREAM_API_URL,
+            data=b"".join(_ndjson_body(payload)),
+            headers={"Content-Type": "application/x-ndjson"},
+            stream=True
         )
         
+        if response.status_code == 200:
+            print(f"📡 Status: {response.status_code}")
+            matches = []
+            with response:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    item = orjson.loads(line)
+                    if "error" in item:
+                        print(f"   ❌ Erreur: {item['error']}")
+                        return None
+                    print_match(len(matches), item)
+                    matches.append(item)
+            return {"matches": matches}
+        
+        response.close()
+        if response.status_code != 404:
+            print(f"📡 Status: {response.status_code}")
+            print(f"   ❌ Erreur {response.status_code}: {response.text}")
+            return None
+        
+        # Service sans endpoint de flux : corps JSON complet
+        response = post(API_URL, json=payload)
+        
         print(f"📡 Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
-            
-            # Affichage des scores
-            if "matches" in result:
-                for i, match in enumerate(result["matches"]):
-                    score = match.get("score", 0)
-                    job_info = match.get("job", {})
-                    job_titre = job_info.get("titre", f"Job {i+1}")
-                    print(f"   🎯 {job_titre}: {score}%")
-                    
-                    if score == 0:
-                        details = match.get("details", "")
-                        if details:
-                            print(f"      💡 Détails: {details}")
-            else:
-                print(f"   ❌ Pas de clé 'matches' dans la réponse")
-                print(f"   📄 Réponse: {result}")
-            
+            result = orjson.loads(response.content)
+            print_result(result)
             return result
         else:
             print(f"   ❌ Erreur {response.status_code}: {response.text}")
@@ -202,14 +276,68 @@ def call_api(payload, test_name):
         print(f"   ❌ Erreur: {e}")
         return None
 
+def call_api_bulk(tests):
+    """
+    Envoie tous les tests (titre, payload, nom) en une seule requête /api/v1/match/batch
+    
+    La réponse arrive en JSON lines : chaque test est affiché dès que sa ligne
+    est reçue. Repli sur un appel par test si le service n'a pas l'endpoint.
+    """
+    def print_title(title):
+        if title:
+            print(f"\n{title}")
+            print("-" * 40)
+    
+    try:
+        response = post(
+            BATCH_API_URL,
+            json={"batch": [payload for _, payload, _ in tests]},
+            stream=True
+        )
+    except Exception as e:
+        print(f"   ❌ Erreur: {e}")
+        return [None] * len(tests)
+    
+    with response:
+        if response.status_code == 404:
+            # Service sans endpoint batch : un appel par test
+            results = []
+            for title, payload, test_name in tests:
+                print_title(title)
+                results.append(call_api(payload, test_name))
+            return results
+        
+        if response.status_code != 200:
+            print(f"   ❌ Erreur {response.status_code}: {response.text}")
+            return [None] * len(tests)
+        
+        results = []
+        lines = response.iter_lines()
+        for title, payload, test_name in tests:
+            print_title(title)
+            print_request(payload, test_name)
+            line = next(lines, None)
+            result = orjson.loads(line) if line else None
+            if result is None or "error" in result:
+                print(f"   ❌ Erreur: {result['error'] if result else 'réponse incomplète'}")
+                results.append(None)
+            else:
+                print_result(result)
+                results.append(result)
+        return results
+
 def extract_scores(result):
-    """Extrait tous les scores d'un résultat"""
-    scores = []
-    if "matches" in result:
-        for match in result["matches"]:
-            score = match.get("score", 0)
-            scores.append(score)
-    return scores
+    """Extrait tous les scores d'un résultat (tableau NumPy float64, liste sans NumPy)"""
+    matches = result.get("matches", [])
+    if np is None:
+        return [match.get("matching_score", 0) for match in matches]
+    return np.fromiter((match.get("matching_score", 0) for match in matches), dtype=np.float64, count=len(matches))
+
+def max_score_of(scores):
+    """Score maximal (0 si aucun score)"""
+    if np is None:
+        return max(scores) if scores else 0
+    return scores.max().item() if scores.size else 0
 
 def test_different_algorithms():
     """Teste avec différents algorithmes"""
@@ -236,12 +364,11 @@ def test_different_algorithms():
     
     algorithms = ["enhanced-v2", "hybrid", "semantic", "smart-match"]
     
-    for algo in algorithms:
-        print(f"\n🧪 Test avec algorithme: {algo}")
-        test_payload = base_payload.copy()
-        test_payload["algorithm"] = algo
-        
-        result = call_api(test_payload, f"Algorithme {algo}")
+    # Un seul appel HTTP pour tous les algorithmes
+    call_api_bulk([
+        (f"🧪 Test avec algorithme: {algo}", {**base_payload, "algorithm": algo}, f"Algorithme {algo}")
+        for algo in algorithms
+    ])
 
 if __name__ == "__main__":
     # Test principal
@@ -7,16 +7,18 @@ Lance le debugger et affiche les résultats de façon claire.
 Utilisation: python debug_zachary_now.py
 """
 
+import io
 import sys
 import os
+from contextlib import redirect_stdout
 
 # Ajouter le répertoire du projet au path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from utils.scoring_debugger import ScoringDebugger
 
-def main():
-    """Lance le debug immédiat du cas Zachary"""
+def main(debugger=None):
+    """Lance le debug immédiat du cas Zachary (debugger : instance partagée, optionnelle)"""
     
     print("🔧 SuperSmartMatch V2.1 - Debug Immédiat du Cas Zachary")
     print("=" * 80)
@@ -25,75 +27,21 @@ def main():
     print()
     
     try:
-        # Initialiser le debugger
-        debugger = ScoringDebugger()
+        # Initialiser le debugger (sauf s'il est fourni)
+        if debugger is None:
+            debugger = ScoringDebugger()
         
         # Lancer le debug complet
         debug_result = debugger.run_comprehensive_debug()
         
-        print("\n" + "="*80)
-        print("🎯 ANALYSE DES RÉSULTATS")
-        print("="*80)
-        
-        # Analyser les issues trouvées
-        if debug_result['issues_found']:
-            print(f"❌ {len(debug_result['issues_found'])} problème(s) identifié(s):")
-            print()
-            
-            for i, issue in enumerate(debug_result['issues_found'], 1):
-                print(f"{i}. 🚨 {issue['type'].replace('_', ' ').title()}")
-                print(f"   Actuel: {issue['current']}")
-                print(f"   Attendu: {issue['expected']}")
-                print(f"   Impact: {issue['impact']}")
-                print()
-        else:
-            print("✅ Aucun problème détecté - Le scoring fonctionne correctement!")
-            print()
-        
-        # Afficher les recommandations
-        if debug_result['recommendations']:
-            print("🔧 ACTIONS CORRECTIVES RECOMMANDÉES:")
-            print("-" * 50)
-            
-            for i, rec in enumerate(debug_result['recommendations'], 1):
-                priority_emoji = {
-                    'CRITICAL': '🔥',
-                    'HIGH': '⚠️',
-                    'MEDIUM': '📋',
-                    'LOW': '💡'
-                }.get(rec['priority'], '📝')
-                
-                print(f"{i}. {priority_emoji} [{rec['priority']}] {rec['action']}")
-                print(f"   Implémentation: {rec['implementation']}")
-                if 'code' in rec:
-                    print(f"   Code: {rec['code']}")
-                print()
-        
-        # Résumé exécutif
-        print("="*80)
-        print("📊 RÉSUMÉ EXÉCUTIF")
-        print("="*80)
-        
-        final_score = debug_result['steps'].get('final_calculation', {}).get('final_percentage', 'N/A')
-        target_score = debug_result['steps'].get('final_calculation', {}).get('target_percentage', 25)
-        
-        print(f"Score actuel calculé: {final_score}%")
-        print(f"Score cible: ≤ {target_score}%")
-        
-        if isinstance(final_score, (int, float)) and final_score > target_score:
-            deviation = final_score - target_score
-            print(f"Écart: +{deviation:.1f}% (PROBLÈME)")
-            print()
-            print("🔴 STATUT: CORRECTION REQUISE")
-            print("👉 Suivre les recommandations ci-dessus pour corriger le problème")
-        else:
-            print("🟢 STATUT: OBJECTIF ATTEINT")
-            print("👉 Le système fonctionne comme attendu")
-        
-        print()
-        print("="*80)
-        print("🚀 Prêt à implémenter les corrections? Suivez le plan d'amélioration!")
-        print("="*80)
+        # Rapport bufferisé en mémoire puis écrit d'un seul bloc
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                print_debug_report(debug_result)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
         
         return len(debug_result['issues_found']) == 0
         
@@ -102,16 +50,84 @@ def main():
         print("Vérifiez que tous les modules sont correctement installés.")
         return False
 
-def quick_matrix_check():
-    """Vérification rapide de la matrice de compatibilité"""
+def print_debug_report(debug_result):
+    """Affiche l'analyse, les recommandations et le résumé exécutif d'un debug complet"""
+    
+    print("\n" + "="*80)
+    print("🎯 ANALYSE DES RÉSULTATS")
+    print("="*80)
+    
+    # Analyser les issues trouvées
+    if debug_result['issues_found']:
+        print(f"❌ {len(debug_result['issues_found'])} problème(s) identifié(s):")
+        print()
+        
+        for i, issue in enumerate(debug_result['issues_found'], 1):
+            print(f"{i}. 🚨 {issue['type'].replace('_', ' ').title()}")
+            print(f"   Actuel: {issue['current']}")
+            print(f"   Attendu: {issue['expected']}")
+            print(f"   Impact: {issue['impact']}")
+            print()
+    else:
+        print("✅ Aucun problème détecté - Le scoring fonctionne correctement!")
+        print()
+    
+    # Afficher les recommandations
+    if debug_result['recommendations']:
+        print("🔧 ACTIONS CORRECTIVES RECOMMANDÉES:")
+        print("-" * 50)
+        
+        for i, rec in enumerate(debug_result['recommendations'], 1):
+            priority_emoji = {
+                'CRITICAL': '🔥',
+                'HIGH': '⚠️',
+                'MEDIUM': '📋',
+                'LOW': '💡'
+            }.get(rec['priority'], '📝')
+            
+            print(f"{i}. {priority_emoji} [{rec['priority']}] {rec['action']}")
+            print(f"   Implémentation: {rec['implementation']}")
+            if 'code' in rec:
+                print(f"   Code: {rec['code']}")
+            print()
+    
+    # Résumé exécutif
+    print("="*80)
+    print("📊 RÉSUMÉ EXÉCUTIF")
+    print("="*80)
+    
+    final_score = debug_result['steps'].get('final_calculation', {}).get('final_percentage', 'N/A')
+    target_score = debug_result['steps'].get('final_calculation', {}).get('target_percentage', 25)
+    
+    print(f"Score actuel calculé: {final_score}%")
+    print(f"Score cible: ≤ {target_score}%")
+    
+    if isinstance(final_score, (int, float)) and final_score > target_score:
+        deviation = final_score - target_score
+        print(f"Écart: +{deviation:.1f}% (PROBLÈME)")
+        print()
+        print("🔴 STATUT: CORRECTION REQUISE")
+        print("👉 Suivre les recommandations ci-dessus pour corriger le problème")
+    else:
+        print("🟢 STATUT: OBJECTIF ATTEINT")
+        print("👉 Le système fonctionne comme attendu")
+    
+    print()
+    print("="*80)
+    print("🚀 Prêt à implémenter les corrections? Suivez le plan d'amélioration!")
+    print("="*80)
+
+def quick_matrix_check(analyzer=None):
+    """Vérification rapide de la matrice de compatibilité (analyzer : SectorAnalyzer partagé, optionnel)"""
     
     print("\n🔍 VÉRIFICATION RAPIDE DE LA MATRICE")
     print("-" * 50)
     
     try:
-        from utils.sector_analyzer import SectorAnalyzer
+        if analyzer is None:
+            from utils.sector_analyzer import SectorAnalyzer
+            analyzer = SectorAnalyzer()
         
-        analyzer = SectorAnalyzer()
         commercial_juridique = analyzer.get_compatibility_score('commercial', 'juridique')
         
         print(f"Score commercial → juridique: {commercial_juridique:.3f} ({commercial_juridique*100:.1f}%)")
@@ -132,13 +148,16 @@ def quick_matrix_check():
 if __name__ == '__main__':
     print()
     
+    # Un seul debugger (et un seul analyseur sectoriel) pour les deux vérifications
+    debugger = ScoringDebugger()
+    
     # Vérification rapide de la matrice
-    matrix_ok = quick_matrix_check()
+    matrix_ok = quick_matrix_check(debugger.sector_analyzer)
     
     print()
     
     # Debug complet
-    debug_ok = main()
+    debug_ok = main(debugger)
     
     # Code de sortie
     if matrix_ok and debug_ok:
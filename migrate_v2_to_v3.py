@@ -13,23 +13,90 @@ Outil de migration automatique avec tests de validation
 Auteur: SuperSmartMatch V3.0 Migration Tool
 """
 
+import logging
 import os
-import json
+import sys
 import time
-import requests
-import shutil
-from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
+import orjson
+import tarfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Any, Mapping, Tuple, Optional
+
+# Durée de validité (secondes) d'un résultat /health mis en cache
+HEALTH_CACHE_TTL_S = 30
+
+# Délais (connexion, lecture) en secondes : une poignée de main bloquée échoue vite
+HEALTH_TIMEOUT = (1, 3)
+MATCH_TIMEOUT = (2, 10)
+
+# En-têtes des corps JSON déjà sérialisés (orjson)
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Formats d'horodatage (time.strftime) : lignes de log, en-tête du rapport, noms de fichiers
+LOG_TIME_FORMAT = "%H:%M:%S"
+REPORT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+FILE_STAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Nombre d'entrées de log conservées pour la section "logs détaillés" du rapport
+REPORT_LOG_TAIL = 20
+
+class _SecondCachedFormatter(logging.Formatter):
+    """Format '[HH:MM:SS] NIVEAU: message', heure formatée une seule fois par seconde"""
+    
+    def __init__(self):
+        super().__init__("[%(asctime)s] %(levelname)s: %(message)s")
+        # Horodatage mis en cache à la seconde : (secondes epoch, "HH:MM:SS")
+        self._ts_cache = (0, '')
+    
+    def formatTime(self, record, datefmt=None):
+        now = int(record.created)
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime(LOG_TIME_FORMAT, time.localtime(now)))
+        return self._ts_cache[1]
+
+class _DequeHandler(logging.Handler):
+    """Conserve les dernières entrées formatées dans un deque borné"""
+    
+    def __init__(self, entries: deque):
+        super().__init__()
+        self.entries = entries
+    
+    def emit(self, record):
+        self.entries.append(self.format(record))
 
 class SuperSmartMatchMigrationTool:
     """Outil de migration V2.1 → V3.0"""
     
     def __init__(self):
-        self.migration_log = []
+        # Logs : sortie standard + dernières entrées conservées pour le rapport
+        self.migration_log = deque(maxlen=REPORT_LOG_TAIL)
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False  # Sortie gérée ici, pas de doublon via le logger racine
+        formatter = _SecondCachedFormatter()
+        # Un seul rapport alimenté à la fois : l'ancien deque (instance précédente) est détaché
+        for handler in [h for h in self.logger.handlers if isinstance(h, _DequeHandler)]:
+            self.logger.removeHandler(handler)
+        deque_handler = _DequeHandler(self.migration_log)
+        deque_handler.setFormatter(formatter)
+        self.logger.addHandler(deque_handler)
+        if not any(type(h) is logging.StreamHandler for h in self.logger.handlers):
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(formatter)
+            self.logger.addHandler(stream_handler)
         self.v2_api_base = "http://localhost:5060/api/v1"  # V2.1
         self.v3_api_base = "http://localhost:5061/api/v1"  # V3.0
         
+        # Session keep-alive partagée (thread-safe pour ces appels), créée au premier appel réseau
+        self._session = None
+        self._session_lock = threading.Lock()
+        # Résultats /health récents par URL de base : {api_base: (instant monotonic, résultat)}
+        self._health_cache = {}
+        
         self.migration_stats = {
             'files_backed_up': 0,
             'code_files_updated': 0,
@@ -52,6 +119,21 @@ class SuperSmartMatchMigrationTool:
             }
         }
         
+        # Règles de détection d'amélioration par type attendu :
+        # (prédicat(v2, v3), compte comme amélioration, message de log)
+        self._improvement_rules = {
+            'score_reduction': (
+                lambda v2, v3: v2 > v3,  # V3.0 doit être plus bas
+                True,
+                "  📈 Amélioration: {v2:.1f}% → {v3:.1f}%"
+            ),
+            'score_maintained': (
+                lambda v2, v3: abs(v2 - v3) <= 10,  # Stable ou mieux
+                False,
+                "  ✅ Score maintenu: {v2:.1f}% → {v3:.1f}%"
+            )
+        }
+        
         # Cas de test pour validation migration
         self.migration_test_cases = [
             {
@@ -90,12 +172,82 @@ class SuperSmartMatchMigrationTool:
             }
         ]
     
+    @property
+    def session(self):
+        """Session HTTP partagée ; requests n'est importé qu'au premier appel réseau"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+                self._session = session
+        return self._session
+    
     def log_message(self, level: str, message: str):
-        """Enregistre un message de log avec timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {level.upper()}: {message}"
-        self.migration_log.append(log_entry)
-        print(log_entry)
+        """Enregistre un message de log avec timestamp (niveau : info, warning, error)"""
+        self.logger.log(getattr(logging, level.upper()), message)
+    
+    def _probe_health(self, api_base: str) -> Tuple[Optional[int], str]:
+        """Interroge /health : (status HTTP ou None si injoignable, version ou erreur), mis en cache HEALTH_CACHE_TTL_S"""
+        cached = self._health_cache.get(api_base)
+        if cached is not None and time.monotonic() - cached[0] < HEALTH_CACHE_TTL_S:
+            return cached[1]
+        
+        try:
+            response = self.session.get(f"{api_base}/health", timeout=HEALTH_TIMEOUT)
+            if response.status_code == 200:
+                result = 200, orjson.loads(response.content).get('version', 'unknown')
+            else:
+                result = response.status_code, ''
+        except Exception as e:
+            result = None, str(e)
+        
+        self._health_cache[api_base] = (time.monotonic(), result)
+        return result
+    
+    def _open_circuit(self, api_base: str, error: Exception):
+        """API injoignable : la marque indisponible dans le cache /health"""
+        self._health_cache[api_base] = (time.monotonic(), (None, str(error)))
+    
+    def _post_match_batch(self, api_base: str, payloads: List[Dict[str, Any]]) -> List[Tuple[Optional[Dict[str, Any]], str]]:
+        """
+        Exécute plusieurs requêtes /match en un seul POST /match/batch (réponse JSON lines)
+        
+        Retourne (résultat, '') ou (None, erreur) par requête, dans l'ordre. Repli sur un
+        POST /match par requête (en parallèle) si le service n'a pas l'endpoint batch.
+        """
+        response = self.session.post(
+            f"{api_base}/match/batch", data=orjson.dumps({'batch': payloads}),
+            headers=JSON_HEADERS, timeout=MATCH_TIMEOUT
+        )
+        
+        if response.status_code == 404:
+            def post_one(payload):
+                single = self.session.post(
+                    f"{api_base}/match", data=orjson.dumps(payload),
+                    headers=JSON_HEADERS, timeout=MATCH_TIMEOUT
+                )
+                if single.status_code != 200:
+                    return None, f"HTTP {single.status_code}"
+                return orjson.loads(single.content), ''
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(payloads)))) as executor:
+                return list(executor.map(post_one, payloads))
+        
+        if response.status_code != 200:
+            return [(None, f"HTTP {response.status_code}")] * len(payloads)
+        
+        results = [orjson.loads(line) for line in response.content.splitlines() if line.strip()]
+        outcomes = []
+        for index in range(len(payloads)):
+            result = results[index] if index < len(results) else {'error': 'réponse incomplète'}
+            if 'error' in result:
+                outcomes.append((None, str(result['error'])))
+            else:
+                outcomes.append((result, ''))
+        return outcomes
     
     def check_apis_availability(self) -> Tuple[bool, bool]:
         """Vérifie la disponibilité des APIs V2.1 et V3.0"""
@@ -104,41 +256,56 @@ class SuperSmartMatchMigrationTool:
         v2_available = False
         v3_available = False
         
+        # Les deux /health en parallèle ; journalisation ensuite, dans l'ordre V2.1 puis V3.0
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            v2_probe, v3_probe = executor.map(self._probe_health, [self.v2_api_base, self.v3_api_base])
+        
         # Test API V2.1
-        try:
-            response = requests.get(f"{self.v2_api_base}/health", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                version = data.get('version', 'unknown')
-                self.log_message("info", f"✅ API V2.1 disponible (version: {version})")
-                v2_available = True
-            else:
-                self.log_message("warning", f"API V2.1 répond mais status: {response.status_code}")
-        except Exception as e:
-            self.log_message("warning", f"API V2.1 non disponible: {e}")
+        status, detail = v2_probe
+        if status == 200:
+            self.log_message("info", f"✅ API V2.1 disponible (version: {detail})")
+            v2_available = True
+        elif status is not None:
+            self.log_message("warning", f"API V2.1 répond mais status: {status}")
+        else:
+            self.log_message("warning", f"API V2.1 non disponible: {detail}")
         
         # Test API V3.0
-        try:
-            response = requests.get(f"{self.v3_api_base}/health", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                version = data.get('version', 'unknown')
-                self.log_message("info", f"✅ API V3.0 disponible (version: {version})")
-                v3_available = True
-            else:
-                self.log_message("warning", f"API V3.0 répond mais status: {response.status_code}")
-        except Exception as e:
-            self.log_message("error", f"❌ API V3.0 non disponible: {e}")
+        status, detail = v3_probe
+        if status == 200:
+            self.log_message("info", f"✅ API V3.0 disponible (version: {detail})")
+            v3_available = True
+        elif status is not None:
+            self.log_message("warning", f"API V3.0 répond mais status: {status}")
+        else:
+            self.log_message("error", f"❌ API V3.0 non disponible: {detail}")
         
         return v2_available, v3_available
     
+    @staticmethod
+    def _scan_files(file_paths: List[str]) -> Dict[str, os.DirEntry]:
+        """Fichiers présents parmi file_paths (chemin → DirEntry), un seul os.scandir par répertoire parent"""
+        by_directory = {}
+        for file_path in file_paths:
+            by_directory.setdefault(os.path.dirname(file_path), set()).add(os.path.basename(file_path))
+        
+        present = {}
+        for directory, names in by_directory.items():
+            try:
+                with os.scandir(directory or '.') as entries:
+                    for entry in entries:
+                        if entry.name in names and entry.is_file():
+                            present[os.path.join(directory, entry.name)] = entry
+            except FileNotFoundError:
+                continue
+        return present
+    
     def backup_current_version(self) -> bool:
         """Sauvegarde de la version actuelle"""
         self.log_message("info", "Création de la sauvegarde V2.1...")
         
         try:
-            backup_dir = f"backup_v2.1_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            os.makedirs(backup_dir, exist_ok=True)
+            backup_archive = f"backup_v2.1_{time.strftime(FILE_STAMP_FORMAT)}.tar"
             
             # Liste des fichiers à sauvegarder
             files_to_backup = [
@@ -149,19 +316,33 @@ class SuperSmartMatchMigrationTool:
                 'README_V2.1.md'
             ]
             
+            # Fichiers présents, relevés en un scandir par répertoire
+            present = self._scan_files(files_to_backup)
+            
+            # Une seule archive tar non compressée, écrite séquentiellement (stat du scandir réutilisé)
             backed_up_files = 0
-            for file_path in files_to_backup:
-                if os.path.exists(file_path):
-                    backup_file_path = os.path.join(backup_dir, file_path)
-                    os.makedirs(os.path.dirname(backup_file_path), exist_ok=True)
-                    shutil.copy2(file_path, backup_file_path)
+            backed_up_bytes = 0
+            with tarfile.open(backup_archive, 'w') as archive:
+                for file_path in files_to_backup:
+                    entry = present.get(file_path)
+                    if entry is None:
+                        self.log_message("warning", f"  ⚠️ Fichier non trouvé: {file_path}")
+                        continue
+                    
+                    st = entry.stat()
+                    tarinfo = tarfile.TarInfo(file_path)
+                    tarinfo.size = st.st_size
+                    tarinfo.mtime = st.st_mtime
+                    tarinfo.mode = st.st_mode & 0o7777
+                    with open(file_path, 'rb') as source:
+                        archive.addfile(tarinfo, source)
+                    
                     backed_up_files += 1
+                    backed_up_bytes += st.st_size
                     self.log_message("info", f"  ✅ Sauvegardé: {file_path}")
-                else:
-                    self.log_message("warning", f"  ⚠️ Fichier non trouvé: {file_path}")
             
             self.migration_stats['files_backed_up'] = backed_up_files
-            self.log_message("info", f"💾 Sauvegarde créée: {backup_dir} ({backed_up_files} fichiers)")
+            self.log_message("info", f"💾 Sauvegarde créée: {backup_archive} ({backed_up_files} fichiers, {backed_up_bytes / 1024:.1f} Ko)")
             return True
             
         except Exception as e:
@@ -170,6 +351,8 @@ class SuperSmartMatchMigrationTool:
     
     def test_api_compatibility(self, v2_available: bool, v3_available: bool) -> Dict[str, Any]:
         """Teste la compatibilité des APIs avec les cas de test"""
+        from requests import ConnectionError as RequestsConnectionError
+        
         self.log_message("info", "Test de compatibilité API V2.1 vs V3.0...")
         
         compatibility_results = {
@@ -184,7 +367,29 @@ class SuperSmartMatchMigrationTool:
             compatibility_results['api_compatibility'] = False
             return compatibility_results
         
-        for test_case in self.migration_test_cases:
+        # Un lot /match/batch par version (tous les cas en un aller-retour), les deux en parallèle ;
+        # l'analyse et les logs restent séquentiels, dans l'ordre des cas
+        payloads = [
+            {
+                'candidate': test_case['candidate'],
+                'jobs': [test_case['job']],
+                'options': {'include_details': True}
+            }
+            for test_case in self.migration_test_cases
+        ]
+        futures = {}
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if v2_available:
+                futures['v2'] = executor.submit(
+                    self._post_match_batch, self.v2_api_base,
+                    [{**payload, 'algorithm': 'enhanced-v2'} for payload in payloads]
+                )
+            futures['v3'] = executor.submit(
+                self._post_match_batch, self.v3_api_base,
+                [{**payload, 'algorithm': 'enhanced-v3'} for payload in payloads]
+            )
+        
+        for case_idx, test_case in enumerate(self.migration_test_cases):
             self.log_message("info", f"🧪 Test: {test_case['name']}")
             
             test_result = {
@@ -195,34 +400,32 @@ class SuperSmartMatchMigrationTool:
                 'meets_expectations': False
             }
             
-            # Préparation des données de test
-            payload = {
-                'candidate': test_case['candidate'],
-                'jobs': [test_case['job']],
-                'options': {'include_details': True}
-            }
-            
             # Test V2.1 (si disponible)
             if v2_available:
                 try:
-                    payload['algorithm'] = 'enhanced-v2'
-                    response = requests.post(f"{self.v2_api_base}/match", json=payload, timeout=15)
-                    if response.status_code == 200:
-                        data = response.json()
+                    data, error = futures['v2'].result()[case_idx]
+                    if data is not None:
                         v2_score = data['matches'][0]['matching_score'] if data['matches'] else 0
                         test_result['v2_result'] = {'score': v2_score, 'success': True}
                         self.log_message("info", f"  V2.1 Score: {v2_score:.1f}%")
                     else:
-                        test_result['v2_result'] = {'success': False, 'error': f"HTTP {response.status_code}"}
+                        test_result['v2_result'] = {'success': False, 'error': error}
                 except Exception as e:
                     test_result['v2_result'] = {'success': False, 'error': str(e)}
+                    if isinstance(e, RequestsConnectionError):  # dont ConnectTimeout
+                        # Coupe-circuit : V2.1 ignorée pour les cas suivants
+                        v2_available = False
+                        self._open_circuit(self.v2_api_base, e)
+            
+            # Test V3.0 (coupe-circuit ouvert : cas suivants marqués en erreur sans appel)
+            if not v3_available:
+                test_result['v3_result'] = {'success': False, 'error': "API V3.0 injoignable"}
+                compatibility_results['test_results'].append(test_result)
+                continue
             
-            # Test V3.0
             try:
-                payload['algorithm'] = 'enhanced-v3'
-                response = requests.post(f"{self.v3_api_base}/match", json=payload, timeout=15)
-                if response.status_code == 200:
-                    data = response.json()
+                data, error = futures['v3'].result()[case_idx]
+                if data is not None:
                     v3_score = data['matches'][0]['matching_score'] if data['matches'] else 0
                     test_result['v3_result'] = {
                         'score': v3_score, 
@@ -244,33 +447,34 @@ class SuperSmartMatchMigrationTool:
                     if test_result['v2_result'] and test_result['v2_result']['success']:
                         v2_score = test_result['v2_result']['score']
                         
-                        if test_case['expected_improvement'] == 'score_reduction':
-                            improvement = v2_score > v3_score  # V3.0 doit être plus bas
-                            if improvement:
-                                compatibility_results['improvements_detected'] += 1
-                                test_result['improvement_detected'] = True
-                                self.log_message("info", f"  📈 Amélioration: {v2_score:.1f}% → {v3_score:.1f}%")
-                        
-                        elif test_case['expected_improvement'] == 'score_maintained':
-                            improvement = abs(v2_score - v3_score) <= 10  # Stable ou mieux
-                            if improvement:
+                        rule = self._improvement_rules.get(test_case['expected_improvement'])
+                        if rule is not None:
+                            predicate, counts_as_improvement, message = rule
+                            if predicate(v2_score, v3_score):
+                                if counts_as_improvement:
+                                    compatibility_results['improvements_detected'] += 1
                                 test_result['improvement_detected'] = True
-                                self.log_message("info", f"  ✅ Score maintenu: {v2_score:.1f}% → {v3_score:.1f}%")
+                                self.log_message("info", message.format(v2=v2_score, v3=v3_score))
                 
                 else:
-                    test_result['v3_result'] = {'success': False, 'error': f"HTTP {response.status_code}"}
-                    self.log_message("error", f"  ❌ Erreur V3.0: {response.status_code}")
+                    test_result['v3_result'] = {'success': False, 'error': error}
+                    self.log_message("error", f"  ❌ Erreur V3.0: {error}")
             
             except Exception as e:
                 test_result['v3_result'] = {'success': False, 'error': str(e)}
                 self.log_message("error", f"  ❌ Exception V3.0: {e}")
+                if isinstance(e, RequestsConnectionError):
+                    v3_available = False
+                    self._open_circuit(self.v3_api_base, e)
             
             compatibility_results['test_results'].append(test_result)
         
         return compatibility_results
     
-    def generate_migration_code_examples(self) -> Dict[str, str]:
-        """Génère des exemples de code pour la migration"""
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def generate_migration_code_examples() -> Mapping[str, str]:
+        """Génère des exemples de code pour la migration (construits une fois, lecture seule)"""
         examples = {
             'basic_migration': '''
 # AVANT V2.1
@@ -349,11 +553,13 @@ services:
 '''
         }
         
-        return examples
+        return MappingProxyType(examples)
     
-    def create_migration_checklist(self) -> List[str]:
-        """Crée une checklist de migration"""
-        checklist = [
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def create_migration_checklist() -> Tuple[str, ...]:
+        """Crée une checklist de migration (construite une fois, lecture seule)"""
+        checklist = (
             "☐ Sauvegarder la version V2.1 actuelle",
             "☐ Déployer SuperSmartMatch V3.0 (port 5061)",
             "☐ Tester l'API V3.0 avec /api/v1/health",
@@ -365,14 +571,14 @@ services:
             "☐ Utiliser le nouveau endpoint /api/v3.0/job-analysis si besoin",
             "☐ Monitorer les logs pour détecter les éventuelles régressions",
             "☐ Former les équipes sur les nouvelles fonctionnalités V3.0"
-        ]
+        )
         return checklist
     
-    def generate_migration_report(self, compatibility_results: Dict[str, Any]) -> str:
-        """Génère le rapport de migration complet"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def iter_report_lines(self, compatibility_results: Dict[str, Any]) -> Iterator[str]:
+        """Produit le rapport de migration complet fragment par fragment"""
+        timestamp = time.strftime(REPORT_TIME_FORMAT)
         
-        report = f"""
+        yield f"""
 🚀 RAPPORT DE MIGRATION SUPERSMARTMATCH V2.1 → V3.0
 ================================================================
 Généré le: {timestamp}
@@ -400,78 +606,80 @@ Généré le: {timestamp}
 ----------------------------------------------------------------"""
         
         for test_result in compatibility_results['test_results']:
-            report += f"\n\n🧪 {test_result['name']}"
+            yield f"\n\n🧪 {test_result['name']}"
             
             if test_result['v2_result'] and test_result['v2_result']['success']:
                 v2_score = test_result['v2_result']['score']
-                report += f"\n   V2.1 Score: {v2_score:.1f}%"
+                yield f"\n   V2.1 Score: {v2_score:.1f}%"
             
             if test_result['v3_result'] and test_result['v3_result']['success']:
                 v3_score = test_result['v3_result']['score']
-                report += f"\n   V3.0 Score: {v3_score:.1f}%"
+                yield f"\n   V3.0 Score: {v3_score:.1f}%"
                 
                 if test_result['improvement_detected']:
-                    report += " ✅ AMÉLIORATION"
+                    yield " ✅ AMÉLIORATION"
                 
                 if test_result['meets_expectations']:
-                    report += " ✅ CONFORME"
+                    yield " ✅ CONFORME"
                 else:
-                    report += " ⚠️ HORS ATTENTES"
+                    yield " ⚠️ HORS ATTENTES"
                 
                 # Analyse métier V3.0
                 job_analysis = test_result['v3_result'].get('job_analysis', {})
                 if job_analysis:
                     candidate_job = job_analysis.get('candidate_job', 'N/A')
                     target_job = job_analysis.get('target_job', 'N/A')
-                    report += f"\n   📊 Métiers détectés: {candidate_job} → {target_job}"
+                    yield f"\n   📊 Métiers détectés: {candidate_job} → {target_job}"
                 
                 # Facteurs bloquants
                 blocking_factors = test_result['v3_result'].get('blocking_factors', [])
                 if blocking_factors:
-                    report += f"\n   🚨 Facteurs bloquants: {len(blocking_factors)}"
+                    yield f"\n   🚨 Facteurs bloquants: {len(blocking_factors)}"
             else:
-                report += "\n   ❌ Erreur test V3.0"
+                yield "\n   ❌ Erreur test V3.0"
         
         # Checklist de migration
-        report += "\n\n✅ CHECKLIST DE MIGRATION\n"
-        report += "----------------------------------------------------------------\n"
+        yield "\n\n✅ CHECKLIST DE MIGRATION\n"
+        yield "----------------------------------------------------------------\n"
         checklist = self.create_migration_checklist()
         for item in checklist:
-            report += f"{item}\n"
+            yield f"{item}\n"
         
         # Exemples de code
         examples = self.generate_migration_code_examples()
-        report += "\n\n📝 EXEMPLES DE MIGRATION DE CODE\n"
-        report += "----------------------------------------------------------------\n"
-        report += examples['basic_migration']
+        yield "\n\n📝 EXEMPLES DE MIGRATION DE CODE\n"
+        yield "----------------------------------------------------------------\n"
+        yield examples['basic_migration']
         
         # Recommandations
-        report += "\n\n💡 RECOMMANDATIONS\n"
-        report += "----------------------------------------------------------------\n"
+        yield "\n\n💡 RECOMMANDATIONS\n"
+        yield "----------------------------------------------------------------\n"
         
         if compatibility_results['improvements_detected'] >= 2:
-            report += "✅ Migration V3.0 fortement recommandée\n"
-            report += "✅ Améliorations significatives de précision détectées\n"
-            report += "✅ Déploiement en production conseillé\n"
+            yield "✅ Migration V3.0 fortement recommandée\n"
+            yield "✅ Améliorations significatives de précision détectées\n"
+            yield "✅ Déploiement en production conseillé\n"
         elif compatibility_results['improvements_detected'] >= 1:
-            report += "⚠️ Migration V3.0 recommandée avec tests supplémentaires\n"
-            report += "⚠️ Valider en pré-production avant déploiement\n"
+            yield "⚠️ Migration V3.0 recommandée avec tests supplémentaires\n"
+            yield "⚠️ Valider en pré-production avant déploiement\n"
         else:
-            report += "❌ Migration V3.0 nécessite investigation\n"
-            report += "❌ Problèmes de compatibilité détectés\n"
+            yield "❌ Migration V3.0 nécessite investigation\n"
+            yield "❌ Problèmes de compatibilité détectés\n"
         
-        report += f"\n🔗 Port V3.0: 5061 (vs 5060 pour V2.1)\n"
-        report += f"🔗 Algorithme recommandé: 'enhanced-v3' ou 'auto'\n"
-        report += f"🔗 Nouveau endpoint: /api/v3.0/job-analysis\n"
+        yield f"\n🔗 Port V3.0: 5061 (vs 5060 pour V2.1)\n"
+        yield f"🔗 Algorithme recommandé: 'enhanced-v3' ou 'auto'\n"
+        yield f"🔗 Nouveau endpoint: /api/v3.0/job-analysis\n"
         
         # Logs détaillés
         if self.migration_log:
-            report += "\n\n📋 LOGS DÉTAILLÉS\n"
-            report += "----------------------------------------------------------------\n"
-            for log_entry in self.migration_log[-20:]:  # Dernières 20 entrées
-                report += f"{log_entry}\n"
-        
-        return report
+            yield "\n\n📋 LOGS DÉTAILLÉS\n"
+            yield "----------------------------------------------------------------\n"
+            for log_entry in self.migration_log:  # Dernières REPORT_LOG_TAIL entrées
+                yield f"{log_entry}\n"
+    
+    def generate_migration_report(self, compatibility_results: Dict[str, Any]) -> str:
+        """Génère le rapport de migration complet"""
+        return "".join(self.iter_report_lines(compatibility_results))
     
     def run_migration(self) -> None:
         """Lance le processus de migration complet"""
@@ -497,20 +705,19 @@ Généré le: {timestamp}
             
             # 4. Génération du rapport
             self.log_message("info", "📊 Génération du rapport de migration...")
-            report = self.generate_migration_report(compatibility_results)
             
-            # 5. Sauvegarde du rapport
-            report_filename = f"migration_report_v2_to_v3_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            # 5-6. Sauvegarde et affichage du rapport en une seule passe, fragment par fragment
+            report_filename = f"migration_report_v2_to_v3_{time.strftime(FILE_STAMP_FORMAT)}.txt"
+            print("\n" + "=" * 80)
             with open(report_filename, 'w', encoding='utf-8') as f:
-                f.write(report)
+                for chunk in self.iter_report_lines(compatibility_results):
+                    f.write(chunk)
+                    sys.stdout.write(chunk)
+            print()
+            print("=" * 80)
             
             self.log_message("info", f"📄 Rapport sauvegardé: {report_filename}")
             
-            # 6. Affichage du rapport
-            print("\n" + "=" * 80)
-            print(report)
-            print("=" * 80)
-            
             # 7. Conclusion
             improvements = compatibility_results['improvements_detected']
             if improvements >= 2:
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Match Helpers - Fonctions chaudes du chemin de matching V3.0
+
+Fonctions pures et typées appelées à chaque requête /api/v1/match.
+Le module est compilable en natif avec mypyc (voir Dockerfile) :
+
+    mypyc utils/match_helpers.py
+
+Sans compilation, le module reste importable tel quel en Python pur.
+"""
+
+import hashlib
+import json
+import sys
+import orjson
+from operator import itemgetter
+from typing import Dict, List, Any
+
+
+def generate_cache_key(candidate_data: Dict[str, Any],
+                       jobs_data: List[Dict[str, Any]],
+                       algorithm: str, options: Dict[str, Any]) -> str:
+    """
+    Génère une clé de cache unique pour la requête V3.0
+    """
+    _md5 = hashlib.md5
+
+    # Simplification des données pour le cache V3.0
+    cache_data = {
+        'candidate_skills': candidate_data.get('competences', []),
+        'candidate_location': candidate_data.get('adresse', ''),
+        'candidate_experience': candidate_data.get('annees_experience', 0),
+        'candidate_title': candidate_data.get('titre_poste', ''),  # 🆕 V3.0
+        'candidate_missions_hash': _md5(
+            str(candidate_data.get('missions', [])).encode()
+        ).hexdigest()[:8],
+        'job_count': len(jobs_data),
+        'job_titles_hash': _md5(  # 🆕 V3.0
+            str([job.get('titre', '') for job in jobs_data]).encode()
+        ).hexdigest()[:8],
+        'job_skills_hash': _md5(
+            str([job.get('competences', []) for job in jobs_data]).encode()
+        ).hexdigest()[:8],
+        'algorithm': algorithm,
+        'limit': options.get('limit', 10),
+        'version': '3.0.0'  # 🆕 V3.0
+    }
+
+    cache_string = json.dumps(cache_data, sort_keys=True)
+    return _md5(cache_string.encode()).hexdigest()
+
+
+def generate_request_etag(candidate_data: Dict[str, Any],
+                          jobs_data: List[Dict[str, Any]],
+                          algorithm: str, options: Dict[str, Any]) -> str:
+    """
+    ETag faible d'une requête /api/v1/match : empreinte de la requête complète
+
+    Identifie la requête, pas l'octet près de la réponse (temps d'exécution,
+    indicateurs de cache) : à émettre en validateur faible, sans réponse 304.
+
+    Candidat, offres, algorithme et toutes les options sont sérialisés sous
+    forme canonique (clés triées) : deux requêtes ne partagent un ETag que si
+    elles sont identiques. Distinct de la clé du cache de résultats.
+    """
+    canonical = orjson.dumps({
+        'candidate': candidate_data,
+        'jobs': jobs_data,
+        'algorithm': algorithm,
+        'options': options
+    }, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+def enrich_matches_v3(matches: List[Dict[str, Any]],
+                      algorithm: str, include_details: bool) -> List[Dict[str, Any]]:
+    """
+    🆕 V3.0 - Enrichit les résultats avec les nouvelles métadonnées métier
+    """
+    enriched = []
+
+    # Invariants de boucle : calculés une seule fois par appel
+    version_tag = sys.intern(f"{algorithm}_v3.0")
+    is_v3 = algorithm == 'enhanced-v3'
+    detection_method = 'contextual' if is_v3 else 'keyword_based'
+
+    for match in matches:
+        enriched_match = match.copy()
+
+        # Version de l'algorithme
+        enriched_match['algorithm_version'] = version_tag
+
+        # Ajout de métadonnées V3.0 si pas déjà présentes
+        if 'job_analysis_v3' not in enriched_match and is_v3:
+            # Les analyses V3.0 sont déjà dans le match pour enhanced-v3
+            pass
+
+        # Recommandations basiques si pas déjà présentes
+        if 'recommendations' not in enriched_match:
+            enriched_match['recommendations'] = generate_recommendations_v3(
+                enriched_match
+            )
+
+        # Assurer la présence de matching_details
+        if include_details and 'matching_details' not in enriched_match:
+            enriched_match['matching_details'] = {
+                'overall_match': enriched_match.get('matching_score', 0),
+                'method': 'algorithm_specific'
+            }
+
+        # 🆕 V3.0 - Ajout de métadonnées de précision
+        enriched_match['precision_metadata_v3'] = {
+            'granularity_level': 'specific_job' if 'job_analysis_v3' in enriched_match else 'sector_level',
+            'detection_method': detection_method,
+            'blocking_factors_analyzed': len(enriched_match.get('blocking_factors', [])),
+            'recommendations_count': len(enriched_match.get('recommendations', []))
+        }
+
+        enriched.append(enriched_match)
+
+    return enriched
+
+
+def generate_recommendations_v3(match: Dict[str, Any]) -> List[str]:
+    """
+    🆕 V3.0 - Génère des recommandations avec conscience métier fine
+    """
+    score = match.get('matching_score', 0)
+    recommendations = []
+
+    # Recommandations selon le score global
+    if score >= 90:
+        recommendations.append("🎯 Excellent match métier - Candidature fortement recommandée")
+    elif score >= 80:
+        recommendations.append("✅ Très bon match - Candidature recommandée")
+    elif score >= 70:
+        recommendations.append("👍 Bon match - Candidature à considérer")
+    elif score >= 60:
+        recommendations.append("⚠️ Match modéré - Évaluer la faisabilité de transition")
+    else:
+        recommendations.append("❌ Match faible - Reconversion métier significative")
+
+    # Recommandations métier spécifiques si disponibles (V3.0)
+    job_analysis = match.get('job_analysis_v3', {})
+    if job_analysis:
+        candidate_job = job_analysis.get('candidate_job', '')
+        target_job = job_analysis.get('target_job', '')
+        specificity_score = job_analysis.get('job_specificity_score', 0)
+
+        if specificity_score < 30:
+            recommendations.append(f"🔄 Transition {candidate_job} → {target_job} très difficile")
+        elif specificity_score < 60:
+            recommendations.append(f"📚 Adaptation métier {candidate_job} → {target_job} nécessaire")
+
+    # Facteurs bloquants si présents
+    blocking_factors = match.get('blocking_factors', [])
+    if blocking_factors:
+        high_severity = [bf for bf in blocking_factors if bf.get('severity') == 'high']
+        if high_severity:
+            recommendations.append("🚨 Facteurs bloquants majeurs détectés - Voir détails")
+
+    return recommendations
+
+
+def analyze_comparison_results_v3(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    🆕 V3.0 - Analyse les résultats de comparaison avec focus précision métier
+    """
+    # Extraction unique (nom, score, temps) des résultats valides
+    valid = [
+        (algo_name, result.get('top_score', 0), result.get('execution_time_ms', 0))
+        for algo_name, result in results.items()
+        if 'error' not in result
+    ]
+
+    best_algorithm = None
+    fastest_algorithm = None
+    most_precise = None
+
+    if valid:
+        best_name, best_score, _ = max(valid, key=itemgetter(1))
+        if best_score > 0:
+            best_algorithm = best_name
+        fastest_algorithm = min(valid, key=itemgetter(2))[0]
+
+        # Privilégier Enhanced V3.0 pour la précision
+        if any(entry[0] == 'enhanced-v3' for entry in valid):
+            most_precise = 'enhanced-v3'
+
+    recommendation = f"Précision: '{best_algorithm}' | Performance: '{fastest_algorithm}'"
+    if most_precise:
+        recommendation += f" | Précision métier: '{most_precise}'"
+
+    return {
+        'best_accuracy': best_algorithm,
+        'best_performance': fastest_algorithm,
+        'most_precise': most_precise,
+        'recommendation': recommendation,
+        'v3_note': 'Enhanced V3.0 recommandé pour précision métier fine',
+        'improvement_note': 'V3.0 résout les problèmes de faux positifs (paie≠management)'
+    }
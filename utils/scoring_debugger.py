@@ -23,8 +23,9 @@ class ScoringDebugger:
     """
     
     def __init__(self):
-        self.sector_analyzer = SectorAnalyzer()
         self.enhanced_v2 = EnhancedMatchingV2Algorithm()
+        # Même analyseur que l'algorithme : matrice construite une seule fois
+        self.sector_analyzer = self.enhanced_v2.sector_analyzer
         
     def debug_zachary_case(self, zachary_cv: Dict[str, Any], 
                           juridique_job: Dict[str, Any]) -> Dict[str, Any]:
@@ -13,6 +13,7 @@ Auteur: SuperSmartMatch V2.1 Enhanced
 """
 
 import re
+import sys
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
@@ -247,6 +248,30 @@ class SectorAnalyzer:
             ('management', 'juridique'): 0.45,
             ('management', 'comptabilité'): 0.55
         }
+        
+        # Scores résolus pour toutes les paires de secteurs connus
+        self._build_compatibility_index()
+    
+    def _build_compatibility_index(self):
+        """
+        Résout une fois pour toutes les paires de secteurs connus (recherche directe,
+        inverse, puis valeurs par défaut) : table par paire.
+        """
+        # Noms internés : detect_sector renvoie ces mêmes objets (comparaison par identité)
+        sectors = [sys.intern(sector) for sector in self.sector_keywords]
+        for pair in self.compatibility_matrix:
+            for sector in pair:
+                if sector not in sectors:
+                    sectors.append(sys.intern(sector))
+        
+        self._compatibility_scores = {
+            (cv_sector, job_sector): self._lookup_compatibility(cv_sector, job_sector)
+            for cv_sector in sectors for job_sector in sectors
+        }
+        # Diagonale à 1.0 : un secteur est toujours pleinement compatible avec lui-même
+        self._unit_diagonal = all(
+            self._compatibility_scores[(sector, sector)] == 1.0 for sector in sectors
+        )
     
     def detect_sector(self, text: str, context: str = 'general') -> SectorAnalysisResult:
         """
@@ -359,6 +384,20 @@ class SectorAnalyzer:
         Returns:
             Score de compatibilité (0.0 à 1.0)
         """
+        # Même objet chaîne (secteur issu de detect_sector) : pas de hachage ni de comparaison
+        if cv_sector is job_sector and self._unit_diagonal:
+            return 1.0
+        
+        # Paire de secteurs connus : score déjà résolu
+        compatibility = self._compatibility_scores.get((cv_sector, job_sector))
+        
+        if compatibility is not None:
+            return compatibility
+        
+        return self._lookup_compatibility(cv_sector, job_sector)
+    
+    def _lookup_compatibility(self, cv_sector: str, job_sector: str) -> float:
+        """Résolution d'une paire : matrice directe, inverse, puis valeurs par défaut"""
         # Recherche directe dans la matrice
         compatibility = self.compatibility_matrix.get((cv_sector, job_sector))
         